@@ -1,5 +1,6 @@
 __all__ = ()
 
+import json
 import os
 from pathlib import Path
 
@@ -118,17 +119,72 @@ LOGIN_URL = "/users/login/student"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/users/login/student"
 
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "users.hashers.StudentCodeHasher",
+]
+
+CURATOR_PAGE_SIZE = int(os.getenv("DJANGO_CURATOR_PAGE_SIZE", 30))
+
+GROUPS_PAGE_SIZE = int(os.getenv("DJANGO_GROUPS_PAGE_SIZE", 50))
+
+STUDENTS_UPLOAD_LIMIT = int(os.getenv("DJANGO_STUDENTS_UPLOAD_LIMIT", 200))
+
+STUDENT_CODE_HASHER = os.getenv("DJANGO_STUDENT_CODE_HASHER", "pbkdf2_sha256_code")
+
+STUDENT_CODE_HASH_ITERATIONS = int(
+    os.getenv("DJANGO_STUDENT_CODE_HASH_ITERATIONS", 100_000),
+)
+
+STUDENT_CODE_HASH_WORKERS = int(
+    os.getenv("DJANGO_STUDENT_CODE_HASH_WORKERS", os.cpu_count() or 1),
+)
+
 AUTHENTICATION_BACKENDS = [
+    "users.backends.StudentCodeBackend",
     "users.backends.EmailOrUsernameModelBackend",
     "django.contrib.auth.backends.ModelBackend",
 ]
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", ""),
+    },
+}
+
+LOGIN_ATTEMPTS_WINDOW = int(os.getenv("DJANGO_LOGIN_ATTEMPTS_WINDOW", 15 * 60))
+
+MAX_AUTH_ATTEMPTS_PER_IP = int(os.getenv("DJANGO_MAX_AUTH_ATTEMPTS_PER_IP", 50))
+
+LOGIN_THROTTLE_IP_HEADER = os.getenv(
+    "DJANGO_LOGIN_THROTTLE_IP_HEADER",
+    "REMOTE_ADDR",
+)
+
 DEFAULT_USER_IS_ACTIVE = is_true(os.getenv("DJANGO_DEFAULT_USER_IS_ACTIVE", "false"))
 
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = BASE_DIR / "send_mail"
 
 DEFAULT_FROM_EMAIL = os.getenv("DJANGO_MAIL", "example@example.com")
+
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv("DJANGO_MAIL_QUEUE_BATCH_SIZE", 50))
+
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("DJANGO_MAIL_QUEUE_MAX_ATTEMPTS", 5))
+
+MAIL_QUEUE_RETRY_DELAY = float(os.getenv("DJANGO_MAIL_QUEUE_RETRY_DELAY", 60))
+
+MAIL_QUEUE_POLL_INTERVAL = float(os.getenv("DJANGO_MAIL_QUEUE_POLL_INTERVAL", 5))
+
+MAIL_QUEUE_LEASE = int(os.getenv("DJANGO_MAIL_QUEUE_LEASE", 5 * 60))
 APPEND_SLASH = True
 
 
@@ -137,6 +193,60 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+PRIVATE_ROOT = BASE_DIR / "private"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "cards": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "exports": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {
+            "location": PRIVATE_ROOT / "exports",
+        },
+    },
+    "codes": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {
+            "location": PRIVATE_ROOT / "codes",
+        },
+    },
+}
+
+CARD_TEMPLATE_PATH = BASE_DIR / "template.png"
+
+CARD_RENDER_EXECUTOR = os.getenv("DJANGO_CARD_RENDER_EXECUTOR", "thread")
+
+CARD_RENDER_WORKERS = int(
+    os.getenv("DJANGO_CARD_RENDER_WORKERS", os.cpu_count() or 1),
+)
+
+CARD_ENCODING = os.getenv("DJANGO_CARD_ENCODING", "png")
+
+CARD_ENCODING_OPTIONS = json.loads(os.getenv("DJANGO_CARD_ENCODING_OPTIONS", "{}"))
+
+CARD_ENCODING_FLATTEN = (
+    is_true(os.environ["DJANGO_CARD_ENCODING_FLATTEN"])
+    if "DJANGO_CARD_ENCODING_FLATTEN" in os.environ
+    else None
+)
+
+CARD_COMPOSITOR = os.getenv("DJANGO_CARD_COMPOSITOR", "pil")
+
+CARD_SHEET_PAPER = os.getenv("DJANGO_CARD_SHEET_PAPER", "A4")
+
+CARD_SHEET_DPI = int(os.getenv("DJANGO_CARD_SHEET_DPI", 300))
+
+EXPORT_JOBS_POLL_INTERVAL = float(os.getenv("DJANGO_EXPORT_JOBS_POLL_INTERVAL", 2))
+
+EXPORT_JOB_TIMEOUT = int(os.getenv("DJANGO_EXPORT_JOB_TIMEOUT", 15 * 60))
+
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
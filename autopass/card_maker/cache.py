@@ -0,0 +1,79 @@
+__all__ = ("CardCache",)
+
+import functools
+import hashlib
+import os
+import posixpath
+
+import django.core.files.base
+
+FILE_DIGEST_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=FILE_DIGEST_CACHE_SIZE)
+def _file_digest(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def file_digest(path):
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class CardCache:
+    def __init__(self, storage, prefix="cards", extension="png"):
+        self.storage = storage
+        self.prefix = prefix
+        self.extension = extension
+
+    def key(self, editor, job):
+        fingerprint = hashlib.sha256()
+        for part in (
+            file_digest(job.photo_path),
+            job.text,
+            file_digest(editor.template_path),
+            editor.circle_size,
+            editor.photo_position,
+            editor.text_position,
+            editor.font_size,
+            editor.encoding,
+            editor.text_box,
+            editor.compositor,
+        ):
+            fingerprint.update(repr(part).encode())
+            fingerprint.update(b"\0")
+
+        return fingerprint.hexdigest()
+
+    def directory(self, owner):
+        return posixpath.join(self.prefix, str(owner))
+
+    def path(self, owner, digest):
+        return posixpath.join(self.directory(owner), f"{digest}.{self.extension}")
+
+    def get(self, owner, digest):
+        path = self.path(owner, digest)
+        if not self.storage.exists(path):
+            return None
+
+        try:
+            with self.storage.open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, owner, digest, content):
+        self.invalidate(owner)
+        self.storage.save(
+            self.path(owner, digest),
+            django.core.files.base.ContentFile(content),
+        )
+
+    def invalidate(self, owner):
+        directory = self.directory(owner)
+        if not self.storage.exists(directory):
+            return
+
+        for name in self.storage.listdir(directory)[1]:
+            self.storage.delete(posixpath.join(directory, name))
@@ -1,62 +1,118 @@
 __all__ = ()
 
+import functools
 import os
 
 import PIL.Image
 import PIL.ImageDraw
-import PIL.ImageFont
+import PIL.ImageOps
 
-font = PIL.ImageFont.truetype(
-    os.path.join(os.path.dirname(__file__), "Wadik.otf"),
-    60,
-)
+import card_maker.compositing
+import card_maker.encoding
+import card_maker.executors
+import card_maker.text
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "Wadik.otf")
+
+TEXT_COLOR = (8, 37, 103)
+
+RENDER_CONTEXT_CACHE_SIZE = 8
+
+
+def crop(im: PIL.Image.Image, s: tuple[int, int]):
+    w, h = im.size
+    k = w / s[0] - h / s[1]
+    offset = h * 0.5
+    if k > 0:
+        im = im.crop(((w - h) / 2, 0, (w + h) / 2, h))
+    elif k < 0:
+        top = max(0, (h - w) / 2 - offset)
+        bottom = top + w
+        im = im.crop((0, top, w, bottom))
+
+    return im.resize(s, PIL.Image.LANCZOS)
+
+
+def prepare_avatar(photo, size: tuple[int, int]):
+    with PIL.Image.open(photo) as im:
+        im.draft("RGB", size)
+        im = PIL.ImageOps.exif_transpose(im)
+        return crop(im.convert("RGB"), size)
+
+
+class RenderContext:
+    def __init__(self, template_path: str, circle_size: tuple[int, int]):
+        with PIL.Image.open(template_path) as template:
+            self.template = template.copy()
+
+        self.mask = self.prepare_mask(circle_size)
+
+    @staticmethod
+    def prepare_mask(circle_size: tuple[int, int], antialias=2):
+        mask = PIL.Image.new(
+            "L",
+            (circle_size[0] * antialias, circle_size[1] * antialias),
+            0,
+        )
+        PIL.ImageDraw.Draw(mask).ellipse((0, 0) + mask.size, fill=255)
+        return mask.resize(circle_size, PIL.Image.LANCZOS)
+
+
+@functools.lru_cache(maxsize=RENDER_CONTEXT_CACHE_SIZE)
+def _load_render_context(template_path, template_mtime, circle_size):
+    return RenderContext(template_path, circle_size)
+
+
+def get_render_context(
+    template_path: str,
+    circle_size: tuple[int, int] = (300, 300),
+):
+    template_path = os.path.abspath(template_path)
+    return _load_render_context(
+        template_path,
+        os.path.getmtime(template_path),
+        tuple(circle_size),
+    )
 
 
 class ImageEditor:
     def __init__(
         self,
         template_path: str,
-        output_path: str,
+        output_path: str | None = None,
         circle_size: tuple[int, int] = (300, 300),
         photo_position: tuple[int, int] = (100, 200),
         text_position: tuple[int, int] = (300, 300),
+        font_size: int = 60,
+        encoding: str | card_maker.encoding.Encoding = "png",
+        text_box: tuple[int, int] | None = None,
+        compositor: str = "pil",
     ):
         self.template_path = template_path
         self.output_path = output_path
         self.circle_size = circle_size
         self.photo_position = photo_position
         self.text_position = text_position
+        self.font_size = font_size
+        self.encoding = encoding
+        self.text_box = tuple(text_box) if text_box else None
+        self.compositor = card_maker.compositing.get_compositor(compositor)
+
+    @property
+    def context(self):
+        return get_render_context(self.template_path, self.circle_size)
+
+    def prepare_photo(self, photo_path: str):
+        with PIL.Image.open(photo_path) as photo:
+            return crop(photo, self.circle_size)
 
     def create_rounded_image(self, photo_path: str):
-        def prepare_mask(antialias=2):
-            mask = PIL.Image.new(
-                "L",
-                (self.circle_size[0] * antialias, self.circle_size[1] * antialias),
-                0,
-            )
-            PIL.ImageDraw.Draw(mask).ellipse((0, 0) + mask.size, fill=255)
-            return mask.resize(self.circle_size, PIL.Image.LANCZOS)
-
-        def crop(im, s):
-            w, h = im.size
-            k = w / s[0] - h / s[1]
-            offset = h * 0.5
-            if k > 0:
-                im = im.crop(((w - h) / 2, 0, (w + h) / 2, h))
-            elif k < 0:
-                top = max(0, (h - w) / 2 - offset)
-                bottom = top + w
-                im = im.crop((0, top, w, bottom))
-
-            return im.resize(s, PIL.Image.LANCZOS)
-
-        im = PIL.Image.open(photo_path)
-        im = crop(im, self.circle_size)
-        im.putalpha(prepare_mask())
+        im = self.prepare_photo(photo_path)
+        im.putalpha(self.context.mask)
         return im
 
     def put_photo_in_template(self, image: PIL.Image.Image):
-        im = PIL.Image.open(self.template_path)
+        im = self.context.template.copy()
         im.paste(
             image,
             self.photo_position,
@@ -64,16 +120,46 @@ class ImageEditor:
         )
         return im
 
+    def composite(self, photo_path: str):
+        if self.compositor == "numpy":
+            return card_maker.compositing.blend_photo(
+                self.context,
+                self.prepare_photo(photo_path),
+                self.photo_position,
+            )
+
+        return self.put_photo_in_template(self.create_rounded_image(photo_path))
+
+    def draw_text(self, image: PIL.Image.Image, text: str):
+        rendered, (left, top) = card_maker.text.render_text(
+            FONT_PATH,
+            text,
+            self.font_size,
+            self.text_box,
+            TEXT_COLOR,
+        )
+        if rendered is None:
+            return image
+
+        position = (self.text_position[0] + left, self.text_position[1] + top)
+        if image.mode == "RGBA":
+            image.alpha_composite(rendered, position)
+        else:
+            image.paste(rendered, position, rendered)
+
+        return image
+
     def draw_text_on_image(
         self,
         image: PIL.Image.Image,
         text: str,
         final_name: str,
     ):
-        draw = PIL.ImageDraw.Draw(image)
-        draw.text(self.text_position, text, (8, 37, 103), font, angle=90)
+        self.draw_text(image, text)
         os.makedirs(self.output_path, exist_ok=True)
-        image.save(f"{self.output_path}/{final_name}")
+        with open(os.path.join(self.output_path, final_name), "wb") as f:
+            f.write(card_maker.encoding.get_encoding(self.encoding).encode(image))
+
         return image
 
     def create_final_image(
@@ -82,13 +168,18 @@ class ImageEditor:
         text: str,
         final_name: str,
     ):
-
-        rounded_image = self.create_rounded_image(image_path)
-
-        template_with_photo = self.put_photo_in_template(rounded_image)
-
         return self.draw_text_on_image(
-            template_with_photo,
+            self.composite(image_path),
             text,
             final_name,
         )
+
+    def render(self, image_path: str, text: str):
+        return self.draw_text(self.composite(image_path), text)
+
+    def render_many(self, jobs, **kwargs):
+        return card_maker.executors.render_many(self, jobs, **kwargs)
+
+    def render_bytes(self, image_path: str, text: str, encoding=None):
+        encoding = card_maker.encoding.get_encoding(encoding or self.encoding)
+        return encoding.encode(self.render(image_path, text))
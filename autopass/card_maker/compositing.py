@@ -0,0 +1,58 @@
+__all__ = ("COMPOSITORS", "blend_photo", "get_compositor")
+
+import functools
+
+import PIL.Image
+
+COMPOSITORS = ("pil", "numpy")
+
+BLEND_CACHE_SIZE = 8
+
+
+def get_compositor(compositor):
+    if compositor not in COMPOSITORS:
+        raise ValueError(f"Unknown card compositor: {compositor}")
+
+    return compositor
+
+
+@functools.lru_cache(maxsize=BLEND_CACHE_SIZE)
+def _prepare(context, position):
+    import numpy
+
+    template = context.template
+    if template.mode not in ("RGB", "RGBA"):
+        template = template.convert("RGBA")
+
+    x, y = position
+    width, height = context.mask.size
+    region = numpy.asarray(
+        template.crop((x, y, x + width, y + height)),
+        dtype=numpy.uint16,
+    )
+    weights = numpy.repeat(
+        numpy.asarray(context.mask, dtype=numpy.uint16)[..., None],
+        region.shape[2],
+        axis=2,
+    )
+    return template, weights, region * (255 - weights) + 127
+
+
+def blend_photo(context, photo, position):
+    import numpy
+
+    position = tuple(position)
+    template, weights, background = _prepare(context, position)
+    if template.mode == "RGBA":
+        photo = photo.convert("RGBA")
+        photo.putalpha(context.mask)
+    elif photo.mode != "RGB":
+        photo = photo.convert("RGB")
+
+    blended = numpy.multiply(numpy.asarray(photo), weights)
+    blended += background
+    blended //= 255
+
+    card = template.copy()
+    card.paste(PIL.Image.fromarray(blended.astype(numpy.uint8)), position)
+    return card
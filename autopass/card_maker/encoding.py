@@ -0,0 +1,83 @@
+__all__ = ("ENCODINGS", "Encoding", "get_encoding")
+
+import io
+import typing
+
+import PIL.Image
+
+
+def flatten(image, background="white"):
+    if image.mode == "RGB":
+        return image
+
+    if image.mode not in ("RGBA", "LA", "PA"):
+        return image.convert("RGB")
+
+    flat = PIL.Image.new("RGB", image.size, background)
+    flat.paste(image, mask=image.getchannel("A"))
+    return flat
+
+
+class Encoding(typing.NamedTuple):
+    name: str
+    image_format: str
+    extension: str
+    content_type: str
+    options: dict
+    flatten: bool = False
+
+    def encode(self, image):
+        if self.flatten:
+            image = flatten(image)
+
+        buffer = io.BytesIO()
+        image.save(buffer, self.image_format, **self.options)
+        return buffer.getvalue()
+
+
+ENCODINGS = {
+    encoding.name: encoding
+    for encoding in (
+        Encoding("png", "PNG", "png", "image/png", {"compress_level": 6}),
+        Encoding(
+            "png-fast",
+            "PNG",
+            "png",
+            "image/png",
+            {"compress_level": 1},
+            flatten=True,
+        ),
+        Encoding(
+            "jpeg",
+            "JPEG",
+            "jpg",
+            "image/jpeg",
+            {"quality": 90, "optimize": True, "subsampling": 0},
+            flatten=True,
+        ),
+        Encoding(
+            "webp",
+            "WEBP",
+            "webp",
+            "image/webp",
+            {"quality": 90, "method": 4},
+            flatten=True,
+        ),
+    )
+}
+
+
+def get_encoding(encoding, options=None, flatten=None):
+    if not isinstance(encoding, Encoding):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown card encoding: {encoding}")
+
+        encoding = ENCODINGS[encoding]
+
+    if options:
+        encoding = encoding._replace(options={**encoding.options, **options})
+
+    if flatten is None:
+        return encoding
+
+    return encoding._replace(flatten=flatten)
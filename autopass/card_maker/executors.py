@@ -0,0 +1,142 @@
+__all__ = ("CardJob", "CardResult", "SerialExecutor", "render_many")
+
+import collections
+import concurrent.futures
+import os
+import time
+import typing
+
+import card_maker.encoding
+
+
+class CardJob(typing.NamedTuple):
+    key: typing.Any
+    photo_path: str
+    text: str
+
+
+class CardResult(typing.NamedTuple):
+    job: CardJob
+    content: bytes | None
+    error: str | None
+    elapsed: float = 0.0
+
+
+class SerialExecutor(concurrent.futures.Executor):
+    def __init__(self, max_workers=None):
+        pass
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+
+        return future
+
+
+EXECUTORS = {
+    "serial": SerialExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+    "process": concurrent.futures.ProcessPoolExecutor,
+}
+
+
+def _completed(result):
+    future = concurrent.futures.Future()
+    future.set_result(result)
+    return future
+
+
+def _render_card(editor, photo_path, text):
+    started = time.perf_counter()
+    try:
+        content = editor.render_bytes(photo_path, text)
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}", time.perf_counter() - started
+
+    return content, None, time.perf_counter() - started
+
+
+def _lookup(cache, editor, job):
+    try:
+        digest = cache.key(editor, job)
+    except OSError:
+        return None, None
+
+    try:
+        return digest, cache.get(job.key, digest)
+    except OSError:
+        return digest, None
+
+
+def _collect(job, future, cache=None, digest=None):
+    try:
+        content, error, elapsed = future.result()
+    except Exception as exc:
+        return CardResult(job, None, f"{type(exc).__name__}: {exc}")
+
+    if error:
+        return CardResult(job, None, error, elapsed)
+
+    if cache and digest:
+        try:
+            cache.set(job.key, digest, content)
+        except OSError:
+            pass
+
+    return CardResult(job, content, None, elapsed)
+
+
+def _as_job(index, job):
+    if isinstance(job, CardJob):
+        return job
+
+    photo_path, text = job
+    return CardJob(index, photo_path, text)
+
+
+def _save(editor, output_path, result):
+    extension = card_maker.encoding.get_encoding(editor.encoding).extension
+    os.makedirs(output_path, exist_ok=True)
+    with open(os.path.join(output_path, f"{result.job.key}.{extension}"), "wb") as f:
+        f.write(result.content)
+
+
+def _render_many(editor, jobs, executor, workers, cache):
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown render executor: {executor}")
+
+    workers = 1 if executor == "serial" else workers or os.cpu_count() or 1
+    pending = collections.deque()
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        for index, job in enumerate(jobs):
+            job = _as_job(index, job)
+            digest, content = _lookup(cache, editor, job) if cache else (None, None)
+            if content is not None:
+                pending.append((job, _completed((content, None, 0.0))))
+            else:
+                future = pool.submit(_render_card, editor, job.photo_path, job.text)
+                pending.append((job, future, cache, digest))
+
+            if len(pending) >= workers * 2:
+                yield _collect(*pending.popleft())
+
+        while pending:
+            yield _collect(*pending.popleft())
+
+
+def render_many(
+    editor,
+    jobs,
+    executor="serial",
+    workers=None,
+    cache=None,
+    output_path=None,
+):
+    for result in _render_many(editor, jobs, executor, workers, cache):
+        if output_path and result.content is not None:
+            _save(editor, output_path, result)
+
+        yield result
@@ -0,0 +1,142 @@
+__all__ = ("PAPER_SIZES", "SheetLayout", "iter_error_pages", "iter_sheets")
+
+import io
+import os
+
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageOps
+
+import card_maker.text
+
+MM_PER_INCH = 25.4
+
+PAPER_SIZES = {
+    "A4": (210, 297),
+    "A3": (297, 420),
+}
+
+CARD_SIZE = (85.6, 54)
+
+ERRORS_FONT_PATH = os.path.join(os.path.dirname(__file__), "arial_bolditalicmt.ttf")
+
+ERRORS_FONT_SIZE = 4
+
+
+class SheetLayout:
+    def __init__(
+        self,
+        paper="A4",
+        dpi=300,
+        card_size=CARD_SIZE,
+        margin=10,
+        gap=4,
+        cut_marks=True,
+    ):
+        if paper not in PAPER_SIZES:
+            raise ValueError(f"Unknown paper size: {paper}")
+
+        self.paper = paper
+        self.dpi = dpi
+        self.cut_marks = cut_marks
+        self.card_size = (self.px(card_size[0]), self.px(card_size[1]))
+        self.margin = self.px(margin)
+        self.gap = self.px(gap)
+
+        width, height = (self.px(side) for side in PAPER_SIZES[paper])
+        self.page_size, self.columns, self.rows = max(
+            ((size, *self._grid(size)) for size in ((width, height), (height, width))),
+            key=lambda layout: layout[1] * layout[2],
+        )
+        self.per_page = self.columns * self.rows
+        if not self.per_page:
+            raise ValueError(f"Card does not fit on {paper}")
+
+        self.positions = self._positions()
+
+    def px(self, millimeters):
+        return round(millimeters / MM_PER_INCH * self.dpi)
+
+    def _grid(self, page_size):
+        return tuple(
+            max((side - 2 * self.margin + self.gap) // (card + self.gap), 0)
+            for side, card in zip(page_size, self.card_size)
+        )
+
+    def _positions(self):
+        grid_width = self.columns * (self.card_size[0] + self.gap) - self.gap
+        grid_height = self.rows * (self.card_size[1] + self.gap) - self.gap
+        left = (self.page_size[0] - grid_width) // 2
+        top = (self.page_size[1] - grid_height) // 2
+        return [
+            (
+                left + column * (self.card_size[0] + self.gap),
+                top + row * (self.card_size[1] + self.gap),
+            )
+            for row in range(self.rows)
+            for column in range(self.columns)
+        ]
+
+    def new_page(self):
+        return PIL.Image.new("RGB", self.page_size, "white")
+
+    def place(self, page, slot, card):
+        if isinstance(card, bytes):
+            card = PIL.Image.open(io.BytesIO(card))
+
+        card = PIL.ImageOps.contain(card, self.card_size, PIL.Image.LANCZOS)
+        x, y = self.positions[slot]
+        offset = (
+            x + (self.card_size[0] - card.width) // 2,
+            y + (self.card_size[1] - card.height) // 2,
+        )
+        if card.mode in ("RGBA", "LA"):
+            page.paste(card, offset, card.getchannel("A"))
+        else:
+            page.paste(card.convert("RGB"), offset)
+
+        if self.cut_marks:
+            PIL.ImageDraw.Draw(page).rectangle(
+                (
+                    offset[0] - 1,
+                    offset[1] - 1,
+                    offset[0] + card.width,
+                    offset[1] + card.height,
+                ),
+                outline=(200, 200, 200),
+            )
+
+
+def iter_sheets(cards, layout):
+    page, slot = None, 0
+    for card in cards:
+        if page is None:
+            page = layout.new_page()
+
+        layout.place(page, slot, card)
+        slot += 1
+        if slot == layout.per_page:
+            yield page
+            page, slot = None, 0
+
+    if page is not None:
+        yield page
+
+
+def iter_error_pages(errors, layout, title="Не удалось напечатать:"):
+    font = card_maker.text.get_font(ERRORS_FONT_PATH, layout.px(ERRORS_FONT_SIZE))
+    line_height = font.size * 3 // 2
+    per_page = max((layout.page_size[1] - 2 * layout.margin) // line_height - 1, 1)
+    for start in range(0, len(errors), per_page):
+        page = layout.new_page()
+        draw = PIL.ImageDraw.Draw(page)
+        lines = [title, *errors[start:][:per_page]]
+        for index, line in enumerate(lines):
+            draw.text(
+                (layout.margin, layout.margin + index * line_height),
+                line,
+                "black",
+                font,
+            )
+
+        yield page
@@ -0,0 +1,80 @@
+__all__ = ("fit_text", "get_font", "render_text")
+
+import functools
+
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+
+FONT_CACHE_SIZE = 64
+
+LAYOUT_CACHE_SIZE = 4096
+
+MIN_FONT_SIZE = 20
+
+_MEASURE = PIL.ImageDraw.Draw(PIL.Image.new("L", (1, 1)))
+
+
+@functools.lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(font_path, size):
+    return PIL.ImageFont.truetype(font_path, size)
+
+
+def _bbox(font, text):
+    return _MEASURE.multiline_textbbox((0, 0), text, font)
+
+
+def _fits(font_path, size, text, box):
+    left, top, right, bottom = _bbox(get_font(font_path, size), text)
+    return right - left <= box[0] and bottom - top <= box[1]
+
+
+def _largest_size(font_path, text, max_size, box, min_size):
+    if not _fits(font_path, min_size, text, box):
+        return None
+
+    low, high = min_size, max_size
+    while low < high:
+        size = (low + high + 1) // 2
+        if _fits(font_path, size, text, box):
+            low = size
+        else:
+            high = size - 1
+
+    return low
+
+
+def _candidates(text):
+    yield text
+    words = text.split()
+    for index in range(1, len(words)):
+        yield f"{' '.join(words[:index])}\n{' '.join(words[index:])}"
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def fit_text(font_path, text, max_size, box=None, min_size=MIN_FONT_SIZE):
+    if box is None:
+        return text, get_font(font_path, max_size)
+
+    min_size = min(min_size, max_size)
+    best_text, best_size = text, None
+    for candidate in _candidates(text):
+        size = _largest_size(font_path, candidate, max_size, box, min_size)
+        if size is not None and (best_size is None or size > best_size):
+            best_text, best_size = candidate, size
+
+        if best_size == max_size:
+            break
+
+    return best_text, get_font(font_path, best_size or min_size)
+
+
+def render_text(font_path, text, max_size, box=None, fill=(0, 0, 0)):
+    text, font = fit_text(font_path, text, max_size, box)
+    left, top, right, bottom = _bbox(font, text)
+    if right <= left or bottom <= top:
+        return None, (0, 0)
+
+    layer = PIL.Image.new("RGBA", (right - left, bottom - top), (*fill, 0))
+    PIL.ImageDraw.Draw(layer).text((-left, -top), text, fill, font)
+    return layer, (left, top)
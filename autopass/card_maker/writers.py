@@ -0,0 +1,103 @@
+__all__ = ("iter_pdf", "iter_zip")
+
+import io
+import zipfile
+
+
+class _StreamBuffer:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        chunks, self.chunks = self.chunks, []
+        return b"".join(chunks)
+
+
+def iter_zip(entries, compression=zipfile.ZIP_STORED):
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=compression) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+            yield buffer.pop()
+
+    yield buffer.pop()
+
+
+class _PdfWriter:
+    def __init__(self):
+        self.offset = 0
+        self.offsets = {}
+
+    def chunk(self, data):
+        self.offset += len(data)
+        return data
+
+    def object(self, number, body, stream=None):
+        self.offsets[number] = self.offset
+        parts = [f"{number} 0 obj\n{body}".encode()]
+        if stream is not None:
+            parts += [b"\nstream\n", stream, b"\nendstream"]
+
+        parts.append(b"\nendobj\n")
+        return self.chunk(b"".join(parts))
+
+    def trailer(self, root):
+        size = max(self.offsets) + 1
+        entries = "".join(
+            f"{self.offsets[number]:010} 00000 n \n" for number in range(1, size)
+        )
+        return self.chunk(
+            (
+                f"xref\n0 {size}\n0000000000 65535 f \n{entries}"
+                f"trailer\n<< /Size {size} /Root {root} 0 R >>\n"
+                f"startxref\n{self.offset}\n%%EOF\n"
+            ).encode(),
+        )
+
+
+def iter_pdf(pages, dpi=300, quality=90):
+    writer = _PdfWriter()
+    yield writer.chunk(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    kids = []
+    number = 3
+    for page in pages:
+        page = page.convert("RGB")
+        buffer = io.BytesIO()
+        page.save(buffer, "JPEG", quality=quality, dpi=(dpi, dpi))
+        jpeg = buffer.getvalue()
+        width = page.width * 72 / dpi
+        height = page.height * 72 / dpi
+        content = f"q {width:.2f} 0 0 {height:.2f} 0 0 cm /Im0 Do Q".encode()
+
+        yield writer.object(
+            number,
+            f"<< /Type /XObject /Subtype /Image /Width {page.width}"
+            f" /Height {page.height} /ColorSpace /DeviceRGB /BitsPerComponent 8"
+            f" /Filter /DCTDecode /Length {len(jpeg)} >>",
+            jpeg,
+        )
+        yield writer.object(number + 1, f"<< /Length {len(content)} >>", content)
+        yield writer.object(
+            number + 2,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width:.2f} {height:.2f}]"
+            f" /Resources << /XObject << /Im0 {number} 0 R >> >>"
+            f" /Contents {number + 1} 0 R >>",
+        )
+        kids.append(number + 2)
+        number += 3
+
+    yield writer.object(
+        2,
+        f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}]"
+        f" /Count {len(kids)} >>",
+    )
+    yield writer.object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+    yield writer.trailer(root=1)
@@ -1,11 +1,30 @@
 __all__ = []
+import io
+import tempfile
+from unittest import mock
+
 import django.contrib.auth.models as auth_models
+import django.core.files.uploadedfile
+import django.db
 import django.shortcuts
 import django.test
+import django.test.utils
+import PIL.Image
 
+import passes.models
 import users.models
 
 
+def create_photo_upload(name="photo.jpg", size=(400, 600)):
+    buffer = io.BytesIO()
+    PIL.Image.new("RGB", size, color=(100, 150, 200)).save(buffer, "JPEG")
+    return django.core.files.uploadedfile.SimpleUploadedFile(
+        name,
+        buffer.getvalue(),
+        content_type="image/jpeg",
+    )
+
+
 class SignUpViewTests(django.test.TestCase):
     def test_get_returns_200(self):
         response = django.test.Client().get(django.shortcuts.reverse("users:signup"))
@@ -119,6 +138,38 @@ class UploadAvatarApiViewTests(django.test.TestCase):
         response = self.client.post(django.shortcuts.reverse("users:upload-avatar-api"))
         self.assertEqual(response.status_code, 400)
 
+    def test_post_invalidates_cached_card(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.client.login(username="student", password="testpass123")
+        with (
+            self.settings(MEDIA_ROOT=media_root.name),
+            mock.patch("card_maker.cache.CardCache.invalidate") as invalidate,
+        ):
+            response = self.client.post(
+                django.shortcuts.reverse("users:upload-avatar-api"),
+                {"avatar": create_photo_upload()},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        invalidate.assert_called_once_with(self.student_user.id)
+
+    def test_post_saves_avatar_derivatives(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.client.login(username="student", password="testpass123")
+        with self.settings(MEDIA_ROOT=media_root.name):
+            self.client.post(
+                django.shortcuts.reverse("users:upload-avatar-api"),
+                {"avatar": create_photo_upload(size=(3000, 4000))},
+            )
+            profile = users.models.Profile.objects.get(user=self.student_user)
+            with PIL.Image.open(profile.avatar_card.path) as card:
+                self.assertEqual(card.size, (760, 760))
+
+            with PIL.Image.open(profile.avatar_thumbnail.path) as thumbnail:
+                self.assertEqual(thumbnail.size, (200, 200))
+
 
 class UploadStudentsViewTests(django.test.TestCase):
     def setUp(self):
@@ -230,3 +281,149 @@ class ResetStudentsViewTests(django.test.TestCase):
             auth_models.User.objects.filter(username="0001-a0b1c2").count(),
             0,
         )
+
+
+class PassRequestsViewTests(django.test.TestCase):
+    def setUp(self):
+        self.client = django.test.Client()
+        self.curator_user = auth_models.User.objects.create_user(
+            username="curator",
+            password="testpass123",
+        )
+        users.models.Profile.objects.create(
+            user=self.curator_user,
+            role="куратор",
+            middle_name="",
+        )
+        self.groups = []
+        for name in ("A", "B"):
+            group = auth_models.Group.objects.create(name=name)
+            users.models.GroupLeader.objects.create(
+                group=group,
+                curator=self.curator_user,
+            )
+            self.groups.append(group)
+
+        self.client.force_login(self.curator_user)
+
+    def create_passes(self, count, status="NotVerify"):
+        for _ in range(count):
+            index = auth_models.User.objects.count()
+            student = auth_models.User.objects.create_user(
+                username=f"student{index}",
+                first_name="Иван",
+                last_name=f"Иванов{index}",
+            )
+            student.groups.add(self.groups[index % 2])
+            users.models.Profile.objects.create(
+                user=student,
+                role="ученик",
+                middle_name="Иванович",
+            )
+            passes.models.Pass.objects.create(user=student, status=status)
+
+    def count_queries(self):
+        with django.test.utils.CaptureQueriesContext(
+            django.db.connection,
+        ) as queries:
+            response = self.client.get(
+                django.shortcuts.reverse("curator:pass-requests"),
+            )
+
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_passes(self):
+        self.create_passes(2)
+        self.create_passes(1, status="NotFilledIn")
+        few = self.count_queries()
+        self.create_passes(10)
+        self.create_passes(5, status="NotFilledIn")
+        self.assertEqual(self.count_queries(), few)
+
+    def test_passes_are_listed_once(self):
+        self.create_passes(3)
+        student = auth_models.User.objects.get(username="student1")
+        auth_models.Group.objects.create(name="C").user_set.add(student)
+
+        response = self.client.get(django.shortcuts.reverse("curator:pass-requests"))
+
+        self.assertEqual(
+            [item.user.username for item in response.context["passes"]],
+            ["student2", "student1", "student3"],
+        )
+
+    def test_keyset_pages_cover_all_passes(self):
+        self.create_passes(5)
+        self.create_passes(2, status="NotFilledIn")
+        url = django.shortcuts.reverse("curator:pass-requests")
+        seen = []
+        query = ""
+        with self.settings(CURATOR_PAGE_SIZE=3):
+            while query is not None:
+                response = self.client.get(f"{url}?{query}")
+                self.assertLessEqual(len(response.context["passes"]), 3)
+                seen.extend(item.id for item in response.context["passes"])
+                query = response.context.get("next_page_query")
+
+        self.assertEqual(
+            sorted(seen),
+            sorted(passes.models.Pass.objects.values_list("id", flat=True)),
+        )
+
+    def test_group_and_status_filters(self):
+        self.create_passes(4)
+        self.create_passes(4, status="NotFilledIn")
+        response = self.client.get(
+            django.shortcuts.reverse("curator:pass-requests"),
+            {"group": self.groups[0].id, "status": "NotFilledIn"},
+        )
+
+        self.assertEqual(len(response.context["passes"]), 2)
+        for item in response.context["passes"]:
+            self.assertEqual(item.group_name, "A")
+            self.assertEqual(item.status, "NotFilledIn")
+
+    def test_bulk_status_ignores_foreign_passes(self):
+        self.create_passes(3)
+        foreign_group = auth_models.Group.objects.create(name="Foreign")
+        foreign = auth_models.User.objects.create_user(username="foreign")
+        foreign.groups.add(foreign_group)
+        foreign_pass = passes.models.Pass.objects.create(
+            user=foreign,
+            status="NotVerify",
+        )
+        own_ids = list(
+            passes.models.Pass.objects.exclude(id=foreign_pass.id).values_list(
+                "id",
+                flat=True,
+            ),
+        )
+
+        response = self.client.post(
+            django.shortcuts.reverse("curator:pass-requests-bulk"),
+            {"pass_ids": [*own_ids, foreign_pass.id], "status": "Verify"},
+            headers={"Accept": "application/json"},
+        )
+
+        self.assertEqual(sorted(response.json()["updated"]), sorted(own_ids))
+        self.assertEqual(
+            passes.models.Pass.objects.filter(status="Verify").count(),
+            3,
+        )
+        foreign_pass.refresh_from_db()
+        self.assertEqual(foreign_pass.status, "NotVerify")
+
+    def test_bulk_status_rejects_unknown_status(self):
+        self.create_passes(1)
+        response = self.client.post(
+            django.shortcuts.reverse("curator:pass-requests-bulk"),
+            {
+                "pass_ids": passes.models.Pass.objects.values_list("id", flat=True),
+                "status": "Printed",
+            },
+            headers={"Accept": "application/json"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(passes.models.Pass.objects.filter(status="Printed").exists())
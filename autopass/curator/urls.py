@@ -12,4 +12,9 @@ urlpatterns = [
         curator.views.PassRequestsView.as_view(),
         name="pass-requests",
     ),
+    django.urls.path(
+        "requests/bulk/",
+        curator.views.BulkPassStatusView.as_view(),
+        name="pass-requests-bulk",
+    ),
 ]
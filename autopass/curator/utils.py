@@ -0,0 +1,24 @@
+__all__ = ("REVIEW_STATUSES", "set_pass_status")
+
+import passes.models
+
+REVIEW_STATUSES = ["Verify", "NotFilledIn"]
+
+
+def set_pass_status(curator, pass_ids, status):
+    if status not in REVIEW_STATUSES:
+        return []
+
+    pass_ids = [int(pass_id) for pass_id in pass_ids if str(pass_id).isdigit()]
+    allowed = list(
+        passes.models.Pass.objects.filter(
+            id__in=pass_ids,
+            user__groups__leader__curator=curator,
+        )
+        .values_list("id", flat=True)
+        .distinct(),
+    )
+    if allowed:
+        passes.models.Pass.objects.filter(id__in=allowed).update(status=status)
+
+    return allowed
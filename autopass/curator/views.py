@@ -1,13 +1,17 @@
-__all__ = ("CuratorRequiredMixin", "PassRequestsView")
+__all__ = ("BulkPassStatusView", "CuratorRequiredMixin", "PassRequestsView")
+import django.conf
 import django.contrib.auth.decorators
+import django.contrib.auth.models
+import django.db.models
 import django.http
 import django.shortcuts
 import django.urls
 import django.utils.decorators
+import django.utils.http
 import django.views.generic
 
+import curator.utils
 import passes.models
-import users.models
 
 
 class CuratorRequiredMixin:
@@ -25,27 +29,108 @@ class PassRequestsView(CuratorRequiredMixin, django.views.generic.ListView):
     template_name = "curator/pass_requests.html"
     context_object_name = "passes"
 
+    statuses = ["NotVerify", "NotFilledIn"]
+
+    def get_filters(self):
+        status = self.request.GET.get("status")
+        group = self.request.GET.get("group", "")
+        after_id = self.request.GET.get("after", "")
+        return {
+            "status": status if status in self.statuses else "",
+            "group": int(group) if group.isdigit() else None,
+            "after_group": self.request.GET.get("after_group"),
+            "after_id": int(after_id) if after_id.isdigit() else None,
+        }
+
     def get_queryset(self):
-        led_groups = users.models.GroupLeader.objects.filter(curator=self.request.user)
-        group_ids = led_groups.values_list("group__id", flat=True)
-        return passes.models.Pass.objects.filter(
-            user__groups__id__in=group_ids,
-            status__in=[
-                "NotFilledIn",
-                "NotVerify",
-            ],
-        ).order_by("user__groups__name")
+        filters = self.get_filters()
+        lookups = {
+            "user__groups__leader__curator": self.request.user,
+            "status__in": [filters["status"]] if filters["status"] else self.statuses,
+        }
+        if filters["group"] is not None:
+            lookups["user__groups__id"] = filters["group"]
+
+        queryset = (
+            passes.models.Pass.objects.filter(**lookups)
+            .annotate(group_name=django.db.models.F("user__groups__name"))
+            .select_related("user__profile")
+            .order_by("group_name", "id")
+            .distinct()
+        )
+        if filters["after_group"] is not None and filters["after_id"] is not None:
+            queryset = queryset.filter(
+                django.db.models.Q(group_name__gt=filters["after_group"])
+                | django.db.models.Q(
+                    group_name=filters["after_group"],
+                    id__gt=filters["after_id"],
+                ),
+            )
+
+        return queryset[: django.conf.settings.CURATOR_PAGE_SIZE + 1]
+
+    def get_context_data(self, **kwargs):
+        page = list(self.object_list)
+        has_next = len(page) > django.conf.settings.CURATOR_PAGE_SIZE
+        page = page[: django.conf.settings.CURATOR_PAGE_SIZE]
+        context = super().get_context_data(object_list=page, **kwargs)
+
+        filters = self.get_filters()
+        query = django.http.QueryDict(mutable=True)
+        query.update(
+            {
+                key: value
+                for key, value in (
+                    ("status", filters["status"]),
+                    ("group", filters["group"]),
+                )
+                if value
+            },
+        )
+        context["filter_query"] = query.urlencode()
+        if has_next:
+            query["after_group"] = page[-1].group_name
+            query["after"] = page[-1].id
+            context["next_page_query"] = query.urlencode()
+
+        context["filters"] = filters
+        context["is_first_page"] = filters["after_id"] is None
+        context["groups"] = django.contrib.auth.models.Group.objects.filter(
+            leader__curator=self.request.user,
+        ).order_by("name")
+        return context
 
     def post(self, request, *args, **kwargs):
-        pass_id = request.POST.get("pass_id")
+        curator.utils.set_pass_status(
+            request.user,
+            [request.POST.get("pass_id")],
+            request.POST.get("status"),
+        )
+        return django.shortcuts.redirect(request.get_full_path())
+
+
+class BulkPassStatusView(CuratorRequiredMixin, django.views.generic.View):
+    def post(self, request):
         status = request.POST.get("status")
+        updated = curator.utils.set_pass_status(
+            request.user,
+            request.POST.getlist("pass_ids"),
+            status,
+        )
+        if request.accepts("text/html"):
+            next_url = request.POST.get("next", "")
+            if not django.utils.http.url_has_allowed_host_and_scheme(
+                next_url,
+                allowed_hosts={request.get_host()},
+            ):
+                next_url = django.urls.reverse("curator:pass-requests")
+
+            return django.shortcuts.redirect(next_url)
 
-        if pass_id and status in ["Verify", "NotFilledIn"]:
-            try:
-                pass_obj = passes.models.Pass.objects.get(id=pass_id)
-                pass_obj.status = status
-                pass_obj.save()
-            except passes.models.Pass.DoesNotExist:
-                pass
+        if status not in curator.utils.REVIEW_STATUSES:
+            return django.http.JsonResponse(
+                {"status": "error", "message": "Неизвестный статус"},
+                status=400,
+            )
 
-        return django.shortcuts.redirect("curator:pass-requests")
+        return django.http.JsonResponse({"status": status, "updated": updated})
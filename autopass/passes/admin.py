@@ -11,3 +11,14 @@ class PassAdmin(django.contrib.admin.ModelAdmin):
         "user",
         "status",
     )
+
+
+@django.contrib.admin.register(passes.models.ExportJob)
+class ExportJobAdmin(django.contrib.admin.ModelAdmin):
+    list_display = (
+        "group",
+        "status",
+        "done",
+        "total",
+        "created_at",
+    )
@@ -0,0 +1,33 @@
+__all__ = ()
+
+import time
+
+import django.conf
+import django.core.management.base
+
+import passes.utils
+
+
+class Command(django.core.management.base.BaseCommand):
+    help = "Формирует архивы пропусков из очереди выгрузок"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать очередь и завершиться",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = passes.utils.claim_export_job()
+            if job is None:
+                if options["once"]:
+                    return
+
+                time.sleep(django.conf.settings.EXPORT_JOBS_POLL_INTERVAL)
+                continue
+
+            self.stdout.write(f"Выгрузка группы {job.group.name}...")
+            job = passes.utils.run_export_job(job)
+            self.stdout.write(f"{job.get_status_display()}: {job.done}/{job.total}")
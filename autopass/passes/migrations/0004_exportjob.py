@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+import django.db.models.deletion
+import passes.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("passes", "0003_remove_pass_photo_alter_pass_status_alter_pass_user"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Pending", "В очереди"),
+                            ("Running", "Формируется"),
+                            ("Done", "Готово"),
+                            ("Failed", "Ошибка"),
+                        ],
+                        default="Pending",
+                        max_length=20,
+                        verbose_name="статус",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="всего пропусков"
+                    ),
+                ),
+                (
+                    "done",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="готово пропусков"
+                    ),
+                ),
+                (
+                    "artifact",
+                    models.FileField(
+                        blank=True,
+                        storage=passes.models.exports_storage,
+                        upload_to="exports/",
+                        verbose_name="архив",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="ошибка")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="export_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="автор",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="export_jobs",
+                        to="auth.group",
+                        verbose_name="группа",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "выгрузка пропусков",
+                "verbose_name_plural": "выгрузки пропусков",
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("passes", "0004_exportjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pass",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("NotFilledIn", "Не заполнено"),
+                    ("NotVerify", "Не проверен"),
+                    ("Verify", "Проверен"),
+                    ("Printed", "Нейтрально"),
+                ],
+                default="NotFilledIn",
+                max_length=20,
+                verbose_name="статус",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pass",
+            index=models.Index(fields=["status", "user"], name="pass_status_user_idx"),
+        ),
+    ]
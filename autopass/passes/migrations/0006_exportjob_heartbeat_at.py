@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("passes", "0005_pass_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
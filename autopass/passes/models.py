@@ -1,6 +1,7 @@
 __all__ = ()
 
 import django.contrib.auth.models
+import django.core.files.storage
 import django.db.models
 from django.utils.translation import gettext_lazy as _
 
@@ -15,6 +16,7 @@ class Pass(django.db.models.Model):
 
     status = django.db.models.CharField(
         "статус",
+        max_length=20,
         choices=RatingChoices,
         default="NotFilledIn",
     )
@@ -23,3 +25,61 @@ class Pass(django.db.models.Model):
         related_name="user_pass",
         on_delete=django.db.models.CASCADE,
     )
+
+    class Meta:
+        indexes = [
+            django.db.models.Index(
+                fields=["status", "user"],
+                name="pass_status_user_idx",
+            ),
+        ]
+
+
+def exports_storage():
+    return django.core.files.storage.storages["exports"]
+
+
+class ExportJob(django.db.models.Model):
+
+    class StatusChoices(django.db.models.TextChoices):
+        Pending = "Pending", _("В очереди")
+        Running = "Running", _("Формируется")
+        Done = "Done", _("Готово")
+        Failed = "Failed", _("Ошибка")
+
+    group = django.db.models.ForeignKey(
+        django.contrib.auth.models.Group,
+        on_delete=django.db.models.CASCADE,
+        related_name="export_jobs",
+        verbose_name="группа",
+    )
+    created_by = django.db.models.ForeignKey(
+        django.contrib.auth.models.User,
+        on_delete=django.db.models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+        verbose_name="автор",
+    )
+    status = django.db.models.CharField(
+        "статус",
+        max_length=20,
+        choices=StatusChoices,
+        default=StatusChoices.Pending,
+    )
+    total = django.db.models.PositiveIntegerField("всего пропусков", default=0)
+    done = django.db.models.PositiveIntegerField("готово пропусков", default=0)
+    artifact = django.db.models.FileField(
+        "архив",
+        upload_to="exports/",
+        storage=exports_storage,
+        blank=True,
+    )
+    error = django.db.models.TextField("ошибка", blank=True)
+    created_at = django.db.models.DateTimeField(auto_now_add=True)
+    heartbeat_at = django.db.models.DateTimeField(null=True, blank=True)
+    finished_at = django.db.models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "выгрузка пропусков"
+        verbose_name_plural = "выгрузки пропусков"
@@ -1,14 +1,39 @@
 __all__ = ()
 
+import datetime
+import io
 import os
 import tempfile
 from unittest.mock import MagicMock, patch
+import zipfile
 
 from django.contrib.auth.models import Group, User
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image, ImageChops, ImageDraw
 
-from passes.models import Pass
+import card_maker.cache
+import card_maker.card_maker
+import card_maker.encoding
+import card_maker.executors
+import card_maker.sheets
+import card_maker.text
+import card_maker.writers
+from passes.models import ExportJob, Pass
+import passes.utils
+from users.models import Profile
+
+
+def create_photo(color=(100, 150, 200), size=(400, 600)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, "JPEG")
+    return buffer.getvalue()
 
 
 class GroupsViewTest(TestCase):
@@ -31,6 +56,48 @@ class GroupsViewTest(TestCase):
         self.assertIn("groups", response.context)
         self.assertEqual(len(response.context["groups"]), 2)
 
+    def get_groups(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("passes:groups"))
+
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_groups_are_annotated_with_pass_counts(self):
+        statuses = ["Verify", "Verify", "NotVerify", "NotFilledIn"]
+        for index, status in enumerate(statuses):
+            user = User.objects.create_user(username=f"student{index}")
+            user.groups.add(self.group1)
+            Pass.objects.create(user=user, status=status)
+
+        _, queries_count = self.get_groups()
+        for index in range(5):
+            Group.objects.create(name=f"group{index}")
+
+        response, more_groups_queries_count = self.get_groups()
+        self.assertEqual(more_groups_queries_count, queries_count)
+        group = next(
+            group for group in response.context["groups"] if group.name == "security"
+        )
+        self.assertEqual(group.students_count, 4)
+        self.assertEqual(group.verified_count, 2)
+        self.assertEqual(group.pending_count, 1)
+        self.assertEqual(group.not_filled_count, 1)
+
+    def test_groups_are_paginated(self):
+        for index in range(3):
+            Group.objects.create(name=f"group{index}")
+
+        with self.settings(GROUPS_PAGE_SIZE=2):
+            response, _ = self.get_groups()
+
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEqual(
+            [group.name for group in response.context["groups"]],
+            ["admin", "group0"],
+        )
+
 
 class DownloadAllGroupPassesViewTest(TestCase):
     def setUp(self):
@@ -69,3 +136,581 @@ class DownloadAllGroupPassesViewTest(TestCase):
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
+
+    def test_failed_card_becomes_error_entry(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        other = User.objects.create_user(
+            username="other",
+            first_name="Jane",
+            last_name="Roe",
+        )
+        other.groups.add(self.group)
+        Profile.objects.create(user=other, role="ученик")
+        Pass.objects.create(user=other, status="Verify")
+        Pass.objects.create(user=self.user, status="Verify")
+
+        with self.settings(MEDIA_ROOT=media_root.name, CARD_RENDER_EXECUTOR="serial"):
+            Profile.objects.create(user=self.user, role="ученик").avatar.save(
+                "avatar.jpg",
+                ContentFile(create_photo()),
+            )
+            self.client.force_login(self.admin)
+            response = self.client.get(
+                reverse("passes:download_group_passes", args=[self.group.id]),
+            )
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertIn("John Doe.png", archive.namelist())
+        self.assertIn("Jane Roe", archive.read("errors.txt").decode())
+
+
+class PrintSheetTest(TestCase):
+    def test_layout_tiles_cards_on_paper(self):
+        a4 = card_maker.sheets.SheetLayout("A4", dpi=300)
+        a3 = card_maker.sheets.SheetLayout("A3", dpi=300)
+
+        self.assertEqual(a4.page_size, (3508, 2480))
+        self.assertEqual(a4.per_page, 9)
+        self.assertEqual(a3.per_page, 18)
+        self.assertEqual(len(set(a4.positions)), a4.per_page)
+        with self.assertRaises(ValueError):
+            card_maker.sheets.SheetLayout("Letter")
+
+    def test_cut_marks_follow_card_bounds(self):
+        layout = card_maker.sheets.SheetLayout("A4", dpi=100)
+        page = layout.new_page()
+        layout.place(page, 0, Image.new("RGB", (1920, 1080), "blue"))
+
+        x, y = layout.positions[0]
+        card_height = round(layout.card_size[0] * 1080 / 1920)
+        top = y + (layout.card_size[1] - card_height) // 2
+        self.assertEqual(page.getpixel((x + 5, y - 1)), (255, 255, 255))
+        self.assertEqual(page.getpixel((x + 5, top - 1)), (200, 200, 200))
+        self.assertEqual(page.getpixel((x + 5, top)), (0, 0, 255))
+
+    def test_failed_cards_are_listed_on_last_page(self):
+        layout = card_maker.sheets.SheetLayout("A4", dpi=50)
+        jobs = [
+            card_maker.executors.CardJob(1, "photo.jpg", "John Doe"),
+            card_maker.executors.CardJob(2, "", "Jane Doe"),
+        ]
+        card = Image.new("RGB", (192, 108))
+        results = [
+            card_maker.executors.CardResult(jobs[0], card, None),
+            card_maker.executors.CardResult(jobs[1], None, "no photo"),
+        ]
+        with patch("passes.utils.iter_card_results", return_value=results):
+            pages = list(passes.utils.iter_card_sheets(jobs, layout))
+
+        self.assertEqual(len(pages), 2)
+        self.assertIsNotNone(ImageChops.invert(pages[1]).getbbox())
+
+    def test_pdf_has_one_page_per_sheet(self):
+        layout = card_maker.sheets.SheetLayout("A4", dpi=50)
+        cards = (Image.new("RGBA", (192, 108), "blue") for _ in range(20))
+
+        content = b"".join(
+            card_maker.writers.iter_pdf(
+                card_maker.sheets.iter_sheets(cards, layout),
+                dpi=layout.dpi,
+            ),
+        )
+
+        self.assertTrue(content.startswith(b"%PDF-1.4"))
+        self.assertTrue(content.endswith(b"%%EOF\n"))
+        self.assertIn(b"/Count 3", content)
+        xref = int(content.rsplit(b"startxref\n", 1)[1].split()[0])
+        self.assertTrue(content[xref:].startswith(b"xref"))
+        entries = content[xref:].split(b"\n")[3:]
+        for number, entry in enumerate(entries[: 1 + 3 * 3], 1):
+            offset = int(entry[:10])
+            self.assertTrue(content[offset:].startswith(f"{number} 0 obj".encode()))
+
+    def test_print_view_streams_pdf(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        group = Group.objects.create(name="security")
+        admin = User.objects.create_superuser(username="admin", password="pass")
+        user = User.objects.create_user(username="student", first_name="John")
+        user.groups.add(group)
+        Pass.objects.create(user=user, status="Verify")
+        self.client.force_login(admin)
+        url = reverse("passes:print_group_passes", args=[group.id])
+
+        with self.settings(
+            MEDIA_ROOT=media_root.name,
+            CARD_RENDER_EXECUTOR="serial",
+            CARD_SHEET_DPI=50,
+        ):
+            Profile.objects.create(user=user, role="ученик").avatar.save(
+                "avatar.jpg",
+                ContentFile(create_photo()),
+            )
+            response = self.client.get(url, {"paper": "A3"})
+            content = b"".join(response.streaming_content)
+            bad_paper = self.client.get(url, {"paper": "B5"})
+
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertIn("security.pdf", response["Content-Disposition"])
+        self.assertIn(b"/Count 1", content)
+        self.assertEqual(bad_paper.status_code, 400)
+
+    def test_print_view_redirects_when_nothing_to_print(self):
+        group = Group.objects.create(name="empty")
+        admin = User.objects.create_superuser(username="admin", password="pass")
+        self.client.force_login(admin)
+
+        response = self.client.get(
+            reverse("passes:print_group_passes", args=[group.id]),
+            follow=True,
+        )
+
+        self.assertRedirects(response, reverse("passes:groups"))
+        self.assertContains(response, "нет проверенных пропусков")
+
+
+class RenderContextTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, "template.png")
+        Image.new("RGBA", (800, 600), color=(255, 255, 200, 255)).save(
+            self.template_path,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_context_is_shared_between_editors(self):
+        first = card_maker.card_maker.ImageEditor(
+            template_path=self.template_path,
+            output_path=self.temp_dir.name,
+            circle_size=(250, 250),
+        )
+        second = card_maker.card_maker.ImageEditor(
+            template_path=self.template_path,
+            output_path=self.temp_dir.name,
+            circle_size=(250, 250),
+        )
+        self.assertIs(first.context, second.context)
+        self.assertEqual(first.context.mask.size, (250, 250))
+
+    def test_context_reloaded_after_template_change(self):
+        context = card_maker.card_maker.get_render_context(self.template_path)
+        mtime = os.path.getmtime(self.template_path)
+        os.utime(self.template_path, (mtime + 10, mtime + 10))
+        self.assertIsNot(
+            card_maker.card_maker.get_render_context(self.template_path),
+            context,
+        )
+
+
+class CompositorTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, "template.png")
+        template = Image.radial_gradient("L").resize((400, 300))
+        Image.merge(
+            "RGBA",
+            (template, template.transpose(Image.FLIP_LEFT_RIGHT), template, template),
+        ).save(self.template_path)
+        self.photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        Image.linear_gradient("L").resize((300, 400)).convert("RGB").save(
+            self.photo_path,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def render(self, compositor):
+        editor = card_maker.card_maker.ImageEditor(
+            template_path=self.template_path,
+            circle_size=(150, 150),
+            photo_position=(40, 60),
+            text_position=(200, 100),
+            compositor=compositor,
+        )
+        return editor.render(self.photo_path, "John Doe")
+
+    def test_numpy_compositor_matches_pil(self):
+        expected = self.render("pil")
+        rendered = self.render("numpy")
+
+        self.assertEqual(rendered.mode, expected.mode)
+        self.assertEqual(rendered.size, expected.size)
+        difference = ImageChops.difference(rendered, expected)
+        self.assertLessEqual(
+            max(high for _, high in difference.getextrema()),
+            1,
+        )
+
+    def test_unknown_compositor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.render("cairo")
+
+
+class RenderCardsTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, "template.png")
+        Image.new("RGBA", (800, 600), color=(255, 255, 200, 255)).save(
+            self.template_path,
+        )
+        self.jobs = []
+        for index in range(5):
+            photo_path = os.path.join(self.temp_dir.name, f"{index}.jpg")
+            with open(photo_path, "wb") as f:
+                f.write(create_photo(color=(index * 40, 100, 100)))
+
+            self.jobs.append(
+                card_maker.executors.CardJob(index, photo_path, f"Student {index}"),
+            )
+
+        self.jobs.insert(2, card_maker.executors.CardJob("missing", "", "Nobody"))
+        self.editor = card_maker.card_maker.ImageEditor(
+            template_path=self.template_path,
+            circle_size=(250, 250),
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_results_keep_job_order(self):
+        for executor in ("serial", "thread", "process"):
+            results = list(
+                card_maker.executors.render_many(
+                    self.editor,
+                    self.jobs,
+                    executor=executor,
+                    workers=3,
+                ),
+            )
+            self.assertEqual(
+                [result.job.key for result in results],
+                [job.key for job in self.jobs],
+            )
+
+    def test_failed_card_does_not_stop_others(self):
+        results = list(card_maker.executors.render_many(self.editor, self.jobs))
+        errors = [result for result in results if result.error]
+        self.assertEqual([result.job.key for result in errors], ["missing"])
+        self.assertTrue(
+            all(result.content for result in results if not result.error),
+        )
+
+    def test_render_many_accepts_tuples_and_reports_timing(self):
+        output_dir = os.path.join(self.temp_dir.name, "output")
+        jobs = [(job.photo_path, job.text) for job in self.jobs[:2]]
+
+        results = list(self.editor.render_many(jobs))
+
+        self.assertEqual([result.job.key for result in results], [0, 1])
+        self.assertTrue(all(result.elapsed > 0 for result in results))
+        self.assertFalse(os.path.exists(output_dir))
+
+        list(self.editor.render_many(jobs, output_path=output_dir))
+        self.assertEqual(sorted(os.listdir(output_dir)), ["0.png", "1.png"])
+
+
+class CardCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, "template.png")
+        Image.new("RGBA", (800, 600), color=(255, 255, 200, 255)).save(
+            self.template_path,
+        )
+        photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        with open(photo_path, "wb") as f:
+            f.write(create_photo())
+
+        self.jobs = [card_maker.executors.CardJob(1, photo_path, "Student")]
+        self.editor = card_maker.card_maker.ImageEditor(
+            template_path=self.template_path,
+            circle_size=(250, 250),
+        )
+        self.cache = card_maker.cache.CardCache(
+            FileSystemStorage(location=self.temp_dir.name),
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def render(self):
+        return list(
+            card_maker.executors.render_many(
+                self.editor,
+                self.jobs,
+                cache=self.cache,
+            ),
+        )
+
+    def test_cached_card_is_not_rendered_again(self):
+        first = self.render()
+        with patch("card_maker.executors._render_card") as render_card:
+            second = self.render()
+
+        render_card.assert_not_called()
+        self.assertEqual(first[0].content, second[0].content)
+
+    def test_changed_text_is_rendered_again(self):
+        self.render()
+        self.jobs = [self.jobs[0]._replace(text="Other")]
+        with patch(
+            "card_maker.executors._render_card",
+            return_value=(b"card", None, 0.0),
+        ) as render_card:
+            self.render()
+
+        render_card.assert_called_once()
+        self.assertEqual(
+            len(self.cache.storage.listdir(self.cache.directory(1))[1]),
+            1,
+        )
+
+    def test_entry_removed_during_lookup_is_a_miss(self):
+        self.render()
+        with patch.object(self.cache, "get", side_effect=OSError("removed")):
+            results = self.render()
+
+        self.assertIsNone(results[0].error)
+        self.assertIsNotNone(results[0].content)
+
+    def test_removed_entry_is_not_found(self):
+        self.render()
+        digest = self.cache.key(self.editor, self.jobs[0])
+        with patch.object(
+            self.cache.storage,
+            "open",
+            side_effect=FileNotFoundError("removed"),
+        ):
+            self.assertIsNone(self.cache.get(1, digest))
+
+    def test_invalidate_removes_owner_entries(self):
+        self.render()
+        self.cache.invalidate(1)
+        self.assertEqual(self.cache.storage.listdir(self.cache.directory(1))[1], [])
+
+    def test_changed_encoding_is_rendered_again(self):
+        self.render()
+        self.editor.encoding = "jpeg"
+        with patch(
+            "card_maker.executors._render_card",
+            return_value=(b"card", None, 0.0),
+        ) as render_card:
+            self.render()
+
+        render_card.assert_called_once()
+
+
+class CardEncodingTest(TestCase):
+    def setUp(self):
+        self.card = Image.new("RGBA", (320, 180), color=(8, 37, 103, 255))
+        self.card.paste((0, 0, 0, 0), (0, 0, 20, 20))
+
+    def test_profiles_encode_to_their_format(self):
+        for name, encoding in card_maker.encoding.ENCODINGS.items():
+            with self.subTest(name):
+                with Image.open(io.BytesIO(encoding.encode(self.card))) as image:
+                    self.assertEqual(image.format, encoding.image_format)
+                    self.assertEqual(image.size, self.card.size)
+                    if encoding.flatten:
+                        self.assertEqual(image.mode, "RGB")
+                        self.assertEqual(
+                            image.convert("RGB").getpixel((5, 5)),
+                            (255, 255, 255),
+                        )
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            card_maker.encoding.get_encoding("tiff")
+
+    def test_settings_override_profile_options(self):
+        with self.settings(
+            CARD_ENCODING="png",
+            CARD_ENCODING_OPTIONS={"compress_level": 3},
+            CARD_ENCODING_FLATTEN=True,
+        ):
+            encoding = passes.utils.get_card_encoding()
+            editor = passes.utils.get_editor()
+
+        self.assertEqual(encoding.options, {"compress_level": 3})
+        self.assertTrue(encoding.flatten)
+        self.assertEqual(editor.encoding, encoding)
+        self.assertEqual(
+            card_maker.encoding.ENCODINGS["png"].options,
+            {"compress_level": 6},
+        )
+        self.assertEqual(
+            card_maker.encoding.get_encoding("png-fast", flatten=False).options,
+            {"compress_level": 1},
+        )
+
+    def test_archive_entries_use_profile_extension(self):
+        jobs = [card_maker.executors.CardJob(1, "photo.jpg", "John Doe")]
+        result = card_maker.executors.CardResult(jobs[0], b"card", None)
+        with (
+            self.settings(CARD_ENCODING="webp"),
+            patch("passes.utils.iter_card_results", return_value=[result]),
+        ):
+            entries = list(passes.utils.iter_card_entries(jobs))
+
+        self.assertEqual(entries, [("John Doe.webp", b"card")])
+
+
+class TextLayoutTest(TestCase):
+    font_path = card_maker.card_maker.FONT_PATH
+
+    def test_short_text_keeps_font_size(self):
+        text, font = card_maker.text.fit_text(
+            self.font_path,
+            "John Doe",
+            60,
+            passes.utils.CARD_TEXT_BOX,
+        )
+
+        self.assertEqual(text, "John Doe")
+        self.assertEqual(font.size, 60)
+
+    def test_long_text_fits_box(self):
+        box = passes.utils.CARD_TEXT_BOX
+        layer, _ = card_maker.text.render_text(
+            self.font_path,
+            "Konstantin Preobrazhensky-Sokolovsky",
+            60,
+            box,
+        )
+
+        self.assertLessEqual(layer.width, box[0])
+        self.assertLessEqual(layer.height, box[1])
+
+    def test_drawn_text_matches_plain_draw(self):
+        editor = card_maker.card_maker.ImageEditor("template.png", font_size=40)
+        image = Image.new("RGB", (600, 400), "white")
+        expected = image.copy()
+        ImageDraw.Draw(expected).text(
+            editor.text_position,
+            "John Doe",
+            card_maker.card_maker.TEXT_COLOR,
+            card_maker.text.get_font(self.font_path, 40),
+        )
+
+        editor.draw_text(image, "John Doe")
+
+        self.assertEqual(image.tobytes(), expected.tobytes())
+
+    def test_text_layout_is_cached(self):
+        fit = card_maker.text.fit_text
+        box = passes.utils.CARD_TEXT_BOX
+        card_maker.text.render_text(self.font_path, "Jane Doe", 60, box)
+        hits = fit.cache_info().hits
+
+        card_maker.text.render_text(self.font_path, "Jane Doe", 60, box)
+
+        self.assertEqual(fit.cache_info().hits, hits + 1)
+
+
+class PrepareAvatarTest(TestCase):
+    def test_exif_orientation_is_applied(self):
+        photo = Image.new("RGB", (600, 400), color=(0, 0, 255))
+        photo.paste((255, 0, 0), (0, 0, 300, 400))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        photo.save(buffer, "JPEG", exif=exif)
+        buffer.seek(0)
+
+        avatar = card_maker.card_maker.prepare_avatar(buffer, (100, 100))
+
+        self.assertEqual(avatar.size, (100, 100))
+        self.assertGreater(avatar.getpixel((50, 10))[0], 200)
+        self.assertGreater(avatar.getpixel((50, 90))[2], 200)
+
+
+class ExportJobTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings = self.settings(
+            MEDIA_ROOT=self.media_root.name,
+            CARD_RENDER_EXECUTOR="serial",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        storage = patch.object(
+            ExportJob._meta.get_field("artifact"),
+            "storage",
+            FileSystemStorage(location=self.media_root.name),
+        )
+        storage.start()
+        self.addCleanup(storage.stop)
+
+        self.group = Group.objects.create(name="security")
+        self.admin = User.objects.create_superuser(username="admin", password="pass")
+        for index in range(3):
+            user = User.objects.create_user(
+                username=f"student{index}",
+                first_name="John",
+                last_name=f"Doe{index}",
+            )
+            user.groups.add(self.group)
+            Profile.objects.create(user=user, role="ученик").avatar.save(
+                "avatar.jpg",
+                ContentFile(create_photo()),
+            )
+            Pass.objects.create(user=user, status="Verify")
+
+        self.client.force_login(self.admin)
+
+    def test_start_export_reuses_unfinished_job(self):
+        url = reverse("passes:start_export", args=[self.group.id])
+        self.client.post(url)
+        response = self.client.post(url, headers={"Accept": "application/json"})
+
+        self.assertEqual(ExportJob.objects.count(), 1)
+        self.assertEqual(response.json()["status"], "Pending")
+
+    def test_worker_builds_downloadable_archive(self):
+        self.client.post(reverse("passes:start_export", args=[self.group.id]))
+        call_command("run_export_jobs", "--once", stdout=io.StringIO())
+
+        job = ExportJob.objects.get()
+        status = self.client.get(reverse("passes:export_status", args=[job.id]))
+        self.assertEqual(status.json()["status"], "Done")
+        self.assertEqual((status.json()["done"], status.json()["total"]), (3, 3))
+
+        response = self.client.get(status.json()["download_url"])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(len(archive.namelist()), 3)
+
+    def test_stale_running_job_is_failed_and_export_restarts(self):
+        stale = ExportJob.objects.create(
+            group=self.group,
+            status=ExportJob.StatusChoices.Running,
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1),
+        )
+
+        response = self.client.post(
+            reverse("passes:start_export", args=[self.group.id]),
+            headers={"Accept": "application/json"},
+        )
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, ExportJob.StatusChoices.Failed)
+        self.assertEqual(response.json()["status"], "Pending")
+        self.assertNotEqual(response.json()["id"], stale.id)
+
+    def test_error_while_collecting_cards_fails_job(self):
+        job = ExportJob.objects.create(group=self.group)
+        with patch("passes.utils.get_card_jobs", side_effect=OSError("disk")):
+            passes.utils.run_export_job(passes.utils.claim_export_job())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.StatusChoices.Failed)
+        self.assertEqual(job.error, "OSError: disk")
+
+    def test_groups_page_shows_job_status(self):
+        ExportJob.objects.create(group=self.group, total=3, done=1)
+        response = self.client.get(reverse("passes:groups"))
+        self.assertContains(response, "1/3")
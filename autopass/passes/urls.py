@@ -12,4 +12,24 @@ urlpatterns = [
         passes.views.DownloadAllGroupPassesView.as_view(),
         name="download_group_passes",
     ),
+    django.urls.path(
+        "groups/<int:group_id>/print/",
+        passes.views.PrintGroupPassesView.as_view(),
+        name="print_group_passes",
+    ),
+    django.urls.path(
+        "groups/<int:group_id>/export/",
+        passes.views.StartGroupExportView.as_view(),
+        name="start_export",
+    ),
+    django.urls.path(
+        "exports/<int:job_id>/",
+        passes.views.ExportJobStatusView.as_view(),
+        name="export_status",
+    ),
+    django.urls.path(
+        "exports/<int:job_id>/download/",
+        passes.views.ExportJobDownloadView.as_view(),
+        name="export_download",
+    ),
 ]
@@ -0,0 +1,220 @@
+__all__ = (
+    "CARD_CIRCLE_SIZE",
+    "claim_export_job",
+    "fail_stale_export_jobs",
+    "get_card_cache",
+    "get_card_encoding",
+    "get_card_jobs",
+    "get_editor",
+    "get_sheet_layout",
+    "iter_card_entries",
+    "iter_card_sheets",
+    "run_export_job",
+)
+
+import datetime
+import tempfile
+
+import django.conf
+import django.core.files
+import django.core.files.storage
+import django.db.models
+import django.utils.timezone
+
+import card_maker.cache
+import card_maker.card_maker
+import card_maker.encoding
+import card_maker.executors
+import card_maker.sheets
+import card_maker.writers
+import passes.models
+
+CARD_CIRCLE_SIZE = (760, 760)
+
+CARD_TEXT_BOX = (900, 160)
+
+
+def get_editor():
+    return card_maker.card_maker.ImageEditor(
+        template_path=str(django.conf.settings.CARD_TEMPLATE_PATH),
+        circle_size=CARD_CIRCLE_SIZE,
+        photo_position=(155, 165),
+        text_position=(950, 600),
+        text_box=CARD_TEXT_BOX,
+        encoding=get_card_encoding(),
+        compositor=django.conf.settings.CARD_COMPOSITOR,
+    )
+
+
+def get_card_encoding():
+    return card_maker.encoding.get_encoding(
+        django.conf.settings.CARD_ENCODING,
+        options=django.conf.settings.CARD_ENCODING_OPTIONS,
+        flatten=django.conf.settings.CARD_ENCODING_FLATTEN,
+    )
+
+
+def get_card_cache():
+    return card_maker.cache.CardCache(
+        django.core.files.storage.storages["cards"],
+        extension=get_card_encoding().extension,
+    )
+
+
+def get_card_jobs(passes_list):
+    jobs = []
+    for pass_obj in passes_list.select_related("user__profile"):
+        profile = pass_obj.user.profile
+        avatar = profile.avatar_card or profile.avatar
+        jobs.append(
+            card_maker.executors.CardJob(
+                key=pass_obj.user.id,
+                photo_path=avatar.path if avatar else "",
+                text=f"{pass_obj.user.first_name} {pass_obj.user.last_name}",
+            ),
+        )
+
+    return jobs
+
+
+def get_group_passes(group):
+    return passes.models.Pass.objects.filter(
+        user__groups=group,
+        status=passes.models.Pass.RatingChoices.Verify,
+    )
+
+
+def get_sheet_layout(paper=None):
+    return card_maker.sheets.SheetLayout(
+        paper=paper or django.conf.settings.CARD_SHEET_PAPER,
+        dpi=django.conf.settings.CARD_SHEET_DPI,
+    )
+
+
+def iter_card_results(jobs):
+    return get_editor().render_many(
+        jobs,
+        executor=django.conf.settings.CARD_RENDER_EXECUTOR,
+        workers=django.conf.settings.CARD_RENDER_WORKERS,
+        cache=get_card_cache(),
+    )
+
+
+def iter_card_sheets(jobs, layout):
+    errors = []
+
+    def iter_cards():
+        for result in iter_card_results(jobs):
+            if result.error:
+                errors.append(f"{result.job.text}: {result.error}")
+            else:
+                yield result.content
+
+    yield from card_maker.sheets.iter_sheets(iter_cards(), layout)
+    if errors:
+        yield from card_maker.sheets.iter_error_pages(errors, layout)
+
+
+def iter_card_entries(jobs, progress=None):
+    extension = get_card_encoding().extension
+    names = set()
+    errors = []
+    for result in iter_card_results(jobs):
+        if progress:
+            progress(result)
+
+        if result.error:
+            errors.append(f"{result.job.text}: {result.error}")
+            continue
+
+        name = f"{result.job.text}.{extension}"
+        copy = 1
+        while name in names:
+            copy += 1
+            name = f"{result.job.text} ({copy}).{extension}"
+
+        names.add(name)
+        yield name, result.content
+
+    if errors:
+        yield "errors.txt", "\n".join(errors).encode()
+
+
+def fail_stale_export_jobs(jobs=None):
+    if jobs is None:
+        jobs = passes.models.ExportJob.objects.all()
+
+    deadline = django.utils.timezone.now() - datetime.timedelta(
+        seconds=django.conf.settings.EXPORT_JOB_TIMEOUT,
+    )
+    return jobs.filter(
+        django.db.models.Q(heartbeat_at__lt=deadline)
+        | django.db.models.Q(heartbeat_at__isnull=True),
+        status=passes.models.ExportJob.StatusChoices.Running,
+    ).update(
+        status=passes.models.ExportJob.StatusChoices.Failed,
+        error="Выгрузка прервана: обработчик перестал отвечать",
+        finished_at=django.utils.timezone.now(),
+    )
+
+
+def claim_export_job():
+    fail_stale_export_jobs()
+    pending = passes.models.ExportJob.objects.filter(
+        status=passes.models.ExportJob.StatusChoices.Pending,
+    )
+    for job in pending.order_by("created_at")[:10]:
+        claimed = pending.filter(pk=job.pk).update(
+            status=passes.models.ExportJob.StatusChoices.Running,
+            heartbeat_at=django.utils.timezone.now(),
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+    return None
+
+
+def run_export_job(job):
+    def progress(result):
+        passes.models.ExportJob.objects.filter(pk=job.pk).update(
+            done=django.db.models.F("done") + 1,
+            heartbeat_at=django.utils.timezone.now(),
+        )
+
+    try:
+        jobs = get_card_jobs(get_group_passes(job.group))
+        job.total = len(jobs)
+        job.save(update_fields=["total"])
+        with tempfile.TemporaryFile() as archive:
+            for chunk in card_maker.writers.iter_zip(
+                iter_card_entries(jobs, progress),
+            ):
+                archive.write(chunk)
+
+            job.artifact.save(
+                f"{job.group.name}.zip",
+                django.core.files.File(archive),
+                save=False,
+            )
+    except Exception as exc:
+        job.refresh_from_db(fields=["done"])
+        job.status = passes.models.ExportJob.StatusChoices.Failed
+        job.error = f"{type(exc).__name__}: {exc}"
+    else:
+        job.status = passes.models.ExportJob.StatusChoices.Done
+        job.done = job.total
+
+    job.finished_at = django.utils.timezone.now()
+    job.save(update_fields=["status", "error", "done", "artifact", "finished_at"])
+    if job.status == passes.models.ExportJob.StatusChoices.Done:
+        for old_job in job.group.export_jobs.filter(
+            status__in=[
+                passes.models.ExportJob.StatusChoices.Done,
+                passes.models.ExportJob.StatusChoices.Failed,
+            ],
+        ).exclude(pk=job.pk):
+            old_job.artifact.delete(save=False)
+            old_job.delete()
+
+    return job
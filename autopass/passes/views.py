@@ -1,14 +1,20 @@
 __all__ = ()
 
-import shutil
-import tempfile
-
+import django.conf
 import django.contrib
 import django.contrib.admin.views.decorators
+import django.contrib.messages
+import django.db.models
+import django.http
+import django.shortcuts
+import django.urls
+import django.utils.http
 import django.views.generic
 
-import card_maker.card_maker
+import card_maker.sheets
+import card_maker.writers
 import passes.models
+import passes.utils
 
 
 @django.utils.decorators.method_decorator(
@@ -20,8 +26,36 @@ class GroupsView(django.views.generic.ListView):
     context_object_name = "groups"
     model = django.contrib.auth.models.Group
 
+    status_counts = {
+        "verified": passes.models.Pass.RatingChoices.Verify,
+        "pending": passes.models.Pass.RatingChoices.NotVerify,
+        "not_filled": passes.models.Pass.RatingChoices.NotFilledIn,
+    }
+
+    def get_paginate_by(self, queryset):
+        return django.conf.settings.GROUPS_PAGE_SIZE
+
     def get_queryset(self):
-        return django.contrib.auth.models.Group.objects.all()
+        latest_exports = django.db.models.Prefetch(
+            "export_jobs",
+            queryset=passes.models.ExportJob.objects.order_by("-created_at")[:1],
+            to_attr="latest_exports",
+        )
+        counts = {
+            f"{name}_count": django.db.models.Count(
+                "user",
+                filter=django.db.models.Q(user__user_pass__status=status),
+            )
+            for name, status in self.status_counts.items()
+        }
+        return (
+            django.contrib.auth.models.Group.objects.annotate(
+                students_count=django.db.models.Count("user"),
+                **counts,
+            )
+            .prefetch_related(latest_exports)
+            .order_by("name")
+        )
 
 
 @django.utils.decorators.method_decorator(
@@ -32,38 +66,132 @@ class DownloadAllGroupPassesView(django.views.generic.View):
     def get(self, request, group_id):
 
         group = django.contrib.auth.models.Group.objects.get(pk=group_id)
-        passes_list = passes.models.Pass.objects.filter(
-            user__groups=group,
-            status="Verify",
+        jobs = passes.utils.get_card_jobs(passes.utils.get_group_passes(group))
+        if not jobs:
+            django.contrib.messages.warning(
+                request,
+                f"В группе {group.name} нет проверенных пропусков для печати",
+            )
+            return django.shortcuts.redirect("passes:groups")
+
+        response = django.http.StreamingHttpResponse(
+            card_maker.writers.iter_zip(passes.utils.iter_card_entries(jobs)),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = django.utils.http.content_disposition_header(
+            as_attachment=True,
+            filename=f"{group.name}.zip",
+        )
+        return response
+
+
+@django.utils.decorators.method_decorator(
+    django.contrib.admin.views.decorators.staff_member_required,
+    name="dispatch",
+)
+class PrintGroupPassesView(django.views.generic.View):
+    def get(self, request, group_id):
+        group = django.shortcuts.get_object_or_404(
+            django.contrib.auth.models.Group,
+            pk=group_id,
         )
+        paper = request.GET.get("paper", django.conf.settings.CARD_SHEET_PAPER)
+        if paper not in card_maker.sheets.PAPER_SIZES:
+            return django.http.HttpResponseBadRequest()
+
+        layout = passes.utils.get_sheet_layout(paper)
+        jobs = passes.utils.get_card_jobs(passes.utils.get_group_passes(group))
+        if not jobs:
+            django.contrib.messages.warning(
+                request,
+                f"В группе {group.name} нет проверенных пропусков для печати",
+            )
+            return django.shortcuts.redirect("passes:groups")
+
+        response = django.http.StreamingHttpResponse(
+            card_maker.writers.iter_pdf(
+                passes.utils.iter_card_sheets(jobs, layout),
+                dpi=layout.dpi,
+            ),
+            content_type="application/pdf",
+        )
+        response["Content-Disposition"] = django.utils.http.content_disposition_header(
+            as_attachment=True,
+            filename=f"{group.name}.pdf",
+        )
+        return response
+
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for pass_obj in passes_list:
-                name = f"{pass_obj.user.first_name} {pass_obj.user.last_name}"
-
-                im = card_maker.card_maker.ImageEditor(
-                    template_path="template.png",
-                    output_path=temp_dir,
-                    circle_size=(760, 760),
-                    photo_position=(155, 165),
-                    text_position=(950, 600),
-                )
-
-                im.create_final_image(
-                    image_path=pass_obj.user.profile.avatar.path,
-                    text=name,
-                    final_name=f"{name}.png",
-                )
-
-            zip_path = f"/tmp/{group.name}.zip"
-            shutil.make_archive(zip_path.replace(".zip", ""), "zip", temp_dir)
-
-            with open(zip_path, "rb") as f:
-                file_content = f.read()
-
-            response = django.http.HttpResponse(
-                file_content,
-                content_type="application/zip",
+@django.utils.decorators.method_decorator(
+    django.contrib.admin.views.decorators.staff_member_required,
+    name="dispatch",
+)
+class StartGroupExportView(django.views.generic.View):
+    def post(self, request, group_id):
+        group = django.shortcuts.get_object_or_404(
+            django.contrib.auth.models.Group,
+            pk=group_id,
+        )
+        passes.utils.fail_stale_export_jobs(group.export_jobs.all())
+        job = group.export_jobs.filter(
+            status__in=[
+                passes.models.ExportJob.StatusChoices.Pending,
+                passes.models.ExportJob.StatusChoices.Running,
+            ],
+        ).first()
+        if job is None:
+            job = passes.models.ExportJob.objects.create(
+                group=group,
+                created_by=request.user,
             )
-            response["Content-Disposition"] = f'attachment; filename="{group.name}.zip"'
-            return response
+
+        if request.accepts("text/html"):
+            return django.shortcuts.redirect("passes:groups")
+
+        return export_job_response(job)
+
+
+@django.utils.decorators.method_decorator(
+    django.contrib.admin.views.decorators.staff_member_required,
+    name="dispatch",
+)
+class ExportJobStatusView(django.views.generic.View):
+    def get(self, request, job_id):
+        job = django.shortcuts.get_object_or_404(passes.models.ExportJob, pk=job_id)
+        return export_job_response(job)
+
+
+@django.utils.decorators.method_decorator(
+    django.contrib.admin.views.decorators.staff_member_required,
+    name="dispatch",
+)
+class ExportJobDownloadView(django.views.generic.View):
+    def get(self, request, job_id):
+        job = django.shortcuts.get_object_or_404(
+            passes.models.ExportJob,
+            pk=job_id,
+            status=passes.models.ExportJob.StatusChoices.Done,
+        )
+        return django.http.FileResponse(
+            job.artifact.open("rb"),
+            as_attachment=True,
+            filename=f"{job.group.name}.zip",
+        )
+
+
+def export_job_response(job):
+    download_url = None
+    if job.status == passes.models.ExportJob.StatusChoices.Done:
+        download_url = django.urls.reverse("passes:export_download", args=[job.id])
+
+    return django.http.JsonResponse(
+        {
+            "id": job.id,
+            "status": job.status,
+            "status_display": job.get_status_display(),
+            "done": job.done,
+            "total": job.total,
+            "error": job.error,
+            "download_url": download_url,
+        },
+    )
@@ -2,7 +2,7 @@ __all__ = ()
 
 from django.contrib import admin, auth
 
-from users.models import Profile
+from users.models import OutgoingMail, Profile
 
 
 class ProfileInline(admin.StackedInline):
@@ -18,3 +18,15 @@ class UserAdmin(auth.admin.UserAdmin):
 
 admin.site.unregister(auth.models.User)
 admin.site.register(auth.models.User, UserAdmin)
+
+
+@admin.register(OutgoingMail)
+class OutgoingMailAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "status",
+        "attempts",
+        "created_at",
+        "sent_at",
+    )
+    list_filter = ("status",)
@@ -1,15 +1,30 @@
-__all__ = ["EmailOrUsernameModelBackend"]
+__all__ = ["EmailOrUsernameModelBackend", "StudentCodeBackend"]
 
 import django.conf
 import django.contrib
 import django.contrib.auth.backends
+import django.contrib.auth.hashers
 import django.core.exceptions
-import django.core.mail
 import django.core.validators
 import django.urls
+import django.utils.crypto
 import django.utils.timezone
 
+from users.hashers import code_digest
+import users.mail
 from users.models import Profile, User
+import users.throttling
+
+
+def is_throttled(request):
+    if not users.throttling.is_ip_limited(request):
+        return False
+
+    django.contrib.messages.error(
+        request,
+        "Слишком много попыток входа, попробуйте позже",
+    )
+    return True
 
 
 class EmailOrUsernameModelBackend(django.contrib.auth.backends.ModelBackend):
@@ -24,11 +39,23 @@ class EmailOrUsernameModelBackend(django.contrib.auth.backends.ModelBackend):
         if not username or not password:
             return None
 
+        if is_throttled(request):
+            raise django.core.exceptions.PermissionDenied
+
         if username == password:
-            user = User.objects.get(username=username)
-            if user.check_password(password) and self.user_can_authenticate(user):
+            try:
+                user = User.objects.get(username=username)
+            except User.DoesNotExist:
+                users.throttling.register_ip_failure(request)
+                return None
+
+            if django.contrib.auth.hashers.check_password(
+                password,
+                user.password,
+            ) and self.user_can_authenticate(user):
                 return user
 
+            users.throttling.register_ip_failure(request)
             return None
 
         if self._is_email(username):
@@ -38,50 +65,93 @@ class EmailOrUsernameModelBackend(django.contrib.auth.backends.ModelBackend):
             try:
                 user = User.objects.get(username=username)
             except User.DoesNotExist:
-                return None
+                user = None
 
         if not user:
+            users.throttling.register_ip_failure(request)
             return None
 
-        profile, _ = Profile.objects.get_or_create(user=user)
-
         if user.check_password(password) and self.user_can_authenticate(user):
-            if profile.attempts_count > 0:
-                profile.attempts_count = 0
-                profile.save()
-
+            users.throttling.reset("account", user.pk)
             return user
 
-        profile.attempts_count += 1
+        users.throttling.register_ip_failure(request)
+        attempts = users.throttling.register_failure("account", user.pk)
+        if user.is_active and attempts >= django.conf.settings.MAX_AUTH_ATTEMPTS:
+            self._lock(request, user, attempts)
+
+        return None
+
+    def _lock(self, request, user, attempts):
+        profile, _ = Profile.objects.get_or_create(user=user)
+        profile.attempts_count = int(attempts)
+        profile.attempts_time = django.utils.timezone.now()
         profile.save()
-        if profile.attempts_count >= django.conf.settings.MAX_AUTH_ATTEMPTS:
-            user.is_active = False
-            profile.attempts_time = django.utils.timezone.now()
-            user.save()
-            profile.save()
-            if request:
-                django.contrib.messages.error(
-                    request,
-                    "Достигнут лимит неправильных входов",
-                )
-
-            django.core.mail.send_mail(
-                subject="Активация аккаунта",
-                message=(
-                    "Превышен лимит ошибок"
-                    "Для подтверждения личности перейдите -"
-                    f"users/activate/{user.username}"
-                ),
-                from_email=django.conf.settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
+        user.is_active = False
+        user.save()
+        if request:
+            django.contrib.messages.error(
+                request,
+                "Достигнут лимит неправильных входов",
             )
 
-        profile.save()
-        return None
+        users.mail.enqueue_mail(
+            subject="Активация аккаунта",
+            message=(
+                "Превышен лимит ошибок"
+                "Для подтверждения личности перейдите -"
+                f"users/activate/{user.username}"
+            ),
+            recipient_list=[user.email],
+        )
+
+    def get_user(self, user_id):
+        try:
+            return User.objects.select_related("profile").get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+
+
+class StudentCodeBackend(django.contrib.auth.backends.ModelBackend):
+    def authenticate(self, request, code=None, **kwargs):
+        if not code:
+            return None
+
+        if is_throttled(request):
+            raise django.core.exceptions.PermissionDenied
+
+        digest = code_digest(code)
+        user = (
+            User.objects.select_related("profile")
+            .filter(profile__code_digest=digest)
+            .first()
+        )
+        if user is None:
+            user = self._authenticate_legacy(code, digest)
+        elif not django.utils.crypto.constant_time_compare(user.username, code):
+            user = None
+
+        if user is None or not self.user_can_authenticate(user):
+            users.throttling.register_ip_failure(request)
+            return None
+
+        return user
+
+    def _authenticate_legacy(self, code, digest):
+        user = (
+            User.objects.select_related("profile")
+            .filter(username=code, profile__role="ученик")
+            .first()
+        )
+        if user is None or not user.check_password(code):
+            return None
+
+        user.profile.code_digest = digest
+        user.profile.save(update_fields=["code_digest"])
+        return user
 
     def get_user(self, user_id):
         try:
-            return User.objects.get(pk=user_id)
+            return User.objects.select_related("profile").get(pk=user_id)
         except User.DoesNotExist:
             return None
@@ -0,0 +1,194 @@
+__all__ = ("build", "invalidate", "open_sheet")
+
+import csv
+import functools
+import io
+import pathlib
+
+import django.core.files.base
+import django.core.files.storage
+import django.utils.timezone
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+
+import card_maker.card_maker
+import card_maker.text
+
+FONT_PATH = (
+    pathlib.Path(card_maker.card_maker.__file__).parent / "arial_bolditalicmt.ttf"
+)
+
+PAGE_DPI = 150
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 100
+HEADER_HEIGHT = 150
+ROW_HEIGHT = 50
+COLUMNS = (("№", 80), ("ФИО", 620), ("Код доступа", 340))
+CELL_PADDING = 10
+CELL_FONT_SIZE = 26
+MIN_CELL_FONT_SIZE = 14
+
+
+@functools.lru_cache
+def _font(size):
+    return PIL.ImageFont.truetype(FONT_PATH, size)
+
+
+def get_storage():
+    return django.core.files.storage.storages["codes"]
+
+
+def get_students(group):
+    return group.user_set.select_related("profile").order_by(
+        "last_name",
+        "first_name",
+        "id",
+    )
+
+
+def sheet_path(group, file_format):
+    return f"{group.id}/codes.{file_format}"
+
+
+def full_name(student):
+    middle_name = student.profile.middle_name
+    names = [student.last_name, student.first_name]
+    if middle_name and middle_name != "-":
+        names.append(middle_name)
+
+    return " ".join(names)
+
+
+def render_csv(group, students):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["№", "Фамилия", "Имя", "Отчество", "Код доступа"])
+    for number, student in enumerate(students, 1):
+        writer.writerow(
+            [
+                number,
+                student.last_name,
+                student.first_name,
+                student.profile.middle_name,
+                student.username,
+            ],
+        )
+
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def _fit_cell(draw, text, width):
+    box = (width - 2 * CELL_PADDING, ROW_HEIGHT - CELL_PADDING)
+    text, font = card_maker.text.fit_text(
+        str(FONT_PATH),
+        text,
+        CELL_FONT_SIZE,
+        box,
+        MIN_CELL_FONT_SIZE,
+    )
+    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font)
+    if right - left <= box[0] and bottom - top <= box[1]:
+        return text, font
+
+    text = " ".join(text.split())
+    while text and draw.textlength(f"{text}…", font) > box[0]:
+        text = text[:-1]
+
+    return f"{text.rstrip()}…", font
+
+
+def _draw_row(draw, top, cells):
+    left = PAGE_MARGIN
+    for (_, width), cell in zip(COLUMNS, cells):
+        draw.rectangle((left, top, left + width, top + ROW_HEIGHT), outline=0, width=2)
+        text, font = _fit_cell(draw, cell, width)
+        _, text_top, _, text_bottom = draw.multiline_textbbox((0, 0), text, font)
+        draw.text(
+            (
+                left + CELL_PADDING,
+                top + (ROW_HEIGHT - text_top - text_bottom) // 2,
+            ),
+            text,
+            font=font,
+            fill=0,
+        )
+        left += width
+
+
+def _iter_pages(group, students):
+    rows = [
+        (str(number), full_name(student), student.username)
+        for number, student in enumerate(students, 1)
+    ]
+    per_page = (PAGE_SIZE[1] - 2 * PAGE_MARGIN - HEADER_HEIGHT) // ROW_HEIGHT - 1
+    created_at = django.utils.timezone.localtime().strftime("%d.%m.%Y %H:%M")
+
+    for start in range(0, max(len(rows), 1), per_page):
+        page = PIL.Image.new("L", PAGE_SIZE, 255)
+        draw = PIL.ImageDraw.Draw(page)
+        draw.text(
+            (PAGE_MARGIN, PAGE_MARGIN),
+            f"Группа: {group.name}",
+            font=_font(40),
+            fill=0,
+        )
+        draw.text(
+            (PAGE_MARGIN, PAGE_MARGIN + 60),
+            f"Дата: {created_at}    Всего учеников: {len(rows)}",
+            font=_font(26),
+            fill=0,
+        )
+        top = PAGE_MARGIN + HEADER_HEIGHT
+        _draw_row(draw, top, [title for title, _ in COLUMNS])
+        for index, row in enumerate(rows[start:][:per_page], 1):
+            _draw_row(draw, top + index * ROW_HEIGHT, row)
+
+        yield page
+
+
+def render_pdf(group, students):
+    first, *rest = _iter_pages(group, students)
+    buffer = io.BytesIO()
+    first.save(
+        buffer,
+        "PDF",
+        save_all=True,
+        append_images=rest,
+        resolution=PAGE_DPI,
+        title=f"Коды доступа: {group.name}",
+    )
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "csv": render_csv,
+}
+
+
+def invalidate(group):
+    storage = get_storage()
+    for file_format in RENDERERS:
+        storage.delete(sheet_path(group, file_format))
+
+
+def build(group):
+    storage = get_storage()
+    students = list(get_students(group))
+    for file_format, render in RENDERERS.items():
+        name = sheet_path(group, file_format)
+        storage.delete(name)
+        storage.save(
+            name,
+            django.core.files.base.ContentFile(render(group, students)),
+        )
+
+
+def open_sheet(group, file_format):
+    storage = get_storage()
+    name = sheet_path(group, file_format)
+    if not storage.exists(name):
+        build(group)
+
+    return storage.open(name)
@@ -31,14 +31,13 @@ class LoginCode(django.contrib.auth.forms.AuthenticationForm):
         if code is not None:
             self.user_cache = django.contrib.auth.authenticate(
                 self.request,
-                username=code,
-                password=code,
+                code=code,
             )
             if self.user_cache is None:
                 raise django.core.exceptions.ValidationError(
                     self.error_messages["invalid_login"],
                     code="invalid_login",
-                    params={"code": code},
+                    params={"username": self.fields["code"].label},
                 )
 
             self.confirm_login_allowed(self.user_cache)
@@ -0,0 +1,21 @@
+__all__ = ("StudentCodeHasher", "code_digest")
+
+import django.conf
+import django.contrib.auth.hashers
+import django.utils.crypto
+
+
+class StudentCodeHasher(django.contrib.auth.hashers.PBKDF2PasswordHasher):
+    algorithm = "pbkdf2_sha256_code"
+
+    @property
+    def iterations(self):
+        return django.conf.settings.STUDENT_CODE_HASH_ITERATIONS
+
+
+def code_digest(code):
+    return django.utils.crypto.salted_hmac(
+        "users.hashers.code_digest",
+        code,
+        algorithm="sha256",
+    ).hexdigest()
@@ -0,0 +1,89 @@
+__all__ = ("claim_mail_batch", "enqueue_mail", "send_mail_batch")
+
+import datetime
+
+import django.conf
+import django.core.mail
+import django.db.models
+import django.utils.timezone
+
+import users.models
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    return users.models.OutgoingMail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or django.conf.settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def claim_mail_batch(size=None):
+    size = size or django.conf.settings.MAIL_QUEUE_BATCH_SIZE
+    now = django.utils.timezone.now()
+    expired = now - datetime.timedelta(seconds=django.conf.settings.MAIL_QUEUE_LEASE)
+    sending = users.models.OutgoingMail.StatusChoices.Sending
+    claimable = users.models.OutgoingMail.objects.filter(
+        django.db.models.Q(
+            status=users.models.OutgoingMail.StatusChoices.Pending,
+            next_attempt_at__lte=now,
+        )
+        | django.db.models.Q(status=sending, claimed_at__lt=expired)
+        | django.db.models.Q(status=sending, claimed_at__isnull=True),
+    )
+    claimed = []
+    for mail in claimable.order_by("next_attempt_at", "id")[:size]:
+        if claimable.filter(pk=mail.pk).update(status=sending, claimed_at=now):
+            claimed.append(mail)
+
+    return claimed
+
+
+def _retry(mail, exc):
+    mail.attempts += 1
+    mail.error = f"{type(exc).__name__}: {exc}"
+    if mail.attempts >= django.conf.settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        mail.status = users.models.OutgoingMail.StatusChoices.Failed
+    else:
+        mail.status = users.models.OutgoingMail.StatusChoices.Pending
+        mail.next_attempt_at = django.utils.timezone.now() + datetime.timedelta(
+            seconds=django.conf.settings.MAIL_QUEUE_RETRY_DELAY
+            * 2 ** (mail.attempts - 1),
+        )
+
+    mail.save(update_fields=["attempts", "error", "status", "next_attempt_at"])
+
+
+def send_mail_batch(mails):
+    sent, handled = [], set()
+    try:
+        connection = django.core.mail.get_connection(fail_silently=False)
+        with connection:
+            for mail in mails:
+                message = django.core.mail.EmailMessage(
+                    subject=mail.subject,
+                    body=mail.message,
+                    from_email=mail.from_email,
+                    to=mail.recipients,
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as exc:
+                    _retry(mail, exc)
+                else:
+                    sent.append(mail.pk)
+
+                handled.add(mail.pk)
+    except Exception as exc:
+        for mail in mails:
+            if mail.pk not in handled:
+                _retry(mail, exc)
+
+    users.models.OutgoingMail.objects.filter(pk__in=sent).update(
+        status=users.models.OutgoingMail.StatusChoices.Sent,
+        sent_at=django.utils.timezone.now(),
+        error="",
+    )
+    return len(sent)
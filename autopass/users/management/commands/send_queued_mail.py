@@ -0,0 +1,32 @@
+__all__ = ()
+
+import time
+
+import django.conf
+import django.core.management.base
+
+import users.mail
+
+
+class Command(django.core.management.base.BaseCommand):
+    help = "Отправляет письма из очереди исходящей почты"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Отправить очередь и завершиться",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            mails = users.mail.claim_mail_batch()
+            if not mails:
+                if options["once"]:
+                    return
+
+                time.sleep(django.conf.settings.MAIL_QUEUE_POLL_INTERVAL)
+                continue
+
+            sent = users.mail.send_mail_batch(mails)
+            self.stdout.write(f"Отправлено писем: {sent}/{len(mails)}")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_groupleader"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_card",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="avatars/cards/",
+                verbose_name="фото для пропуска",
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_thumbnail",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="avatars/thumbnails/",
+                verbose_name="миниатюра",
+            ),
+        ),
+    ]
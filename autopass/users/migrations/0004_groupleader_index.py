@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0003_profile_avatar_derivatives"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="groupleader",
+            index=models.Index(
+                fields=["curator", "group"], name="groupleader_curator_group_idx"
+            ),
+        ),
+    ]
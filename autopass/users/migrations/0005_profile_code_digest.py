@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+from users.hashers import code_digest
+
+
+def fill_code_digests(apps, schema_editor):
+    Profile = apps.get_model("users", "Profile")
+    profiles = list(Profile.objects.filter(role="ученик").select_related("user"))
+    for profile in profiles:
+        profile.code_digest = code_digest(profile.user.username)
+
+    Profile.objects.bulk_update(profiles, ["code_digest"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_groupleader_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="code_digest",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="отпечаток кода доступа",
+            ),
+        ),
+        migrations.RunPython(fill_code_digests, migrations.RunPython.noop),
+    ]
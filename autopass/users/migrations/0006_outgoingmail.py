@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_profile_code_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutgoingMail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="тема")),
+                ("message", models.TextField(verbose_name="текст")),
+                (
+                    "from_email",
+                    models.CharField(max_length=254, verbose_name="отправитель"),
+                ),
+                (
+                    "recipients",
+                    models.JSONField(default=list, verbose_name="получатели"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Pending", "В очереди"),
+                            ("Sending", "Отправляется"),
+                            ("Sent", "Отправлено"),
+                            ("Failed", "Ошибка"),
+                        ],
+                        default="Pending",
+                        max_length=20,
+                        verbose_name="статус",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="попыток отправки"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="ошибка")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="следующая попытка",
+                    ),
+                ),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "исходящее письмо",
+                "verbose_name_plural": "исходящие письма",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "Pending")),
+                        fields=["next_attempt_at"],
+                        name="outgoingmail_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
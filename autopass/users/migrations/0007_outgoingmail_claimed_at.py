@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_outgoingmail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outgoingmail",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
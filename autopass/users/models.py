@@ -1,9 +1,11 @@
-__all__ = ("Profile", "User", "UserManager")
+__all__ = ("OutgoingMail", "Profile", "User", "UserManager")
 import sys
 
 import django.contrib.auth
 import django.contrib.auth.models
 import django.db.models
+import django.utils.timezone
+from django.utils.translation import gettext_lazy as _
 
 
 user = django.contrib.auth.get_user_model()
@@ -77,7 +79,27 @@ class Profile(django.db.models.Model):
         null=True,
         verbose_name="Аватар",
     )
+    avatar_card = django.db.models.ImageField(
+        upload_to="avatars/cards/",
+        blank=True,
+        null=True,
+        verbose_name="фото для пропуска",
+    )
+    avatar_thumbnail = django.db.models.ImageField(
+        upload_to="avatars/thumbnails/",
+        blank=True,
+        null=True,
+        verbose_name="миниатюра",
+    )
     middle_name = django.db.models.CharField(max_length=50)
+    code_digest = django.db.models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="отпечаток кода доступа",
+    )
     attempts_count = django.db.models.PositiveIntegerField(
         default=0,
         blank=False,
@@ -103,3 +125,51 @@ class GroupLeader(django.db.models.Model):
         related_name="led_groups",
     )
     created_at = django.db.models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            django.db.models.Index(
+                fields=["curator", "group"],
+                name="groupleader_curator_group_idx",
+            ),
+        ]
+
+
+class OutgoingMail(django.db.models.Model):
+
+    class StatusChoices(django.db.models.TextChoices):
+        Pending = "Pending", _("В очереди")
+        Sending = "Sending", _("Отправляется")
+        Sent = "Sent", _("Отправлено")
+        Failed = "Failed", _("Ошибка")
+
+    subject = django.db.models.CharField("тема", max_length=255)
+    message = django.db.models.TextField("текст")
+    from_email = django.db.models.CharField("отправитель", max_length=254)
+    recipients = django.db.models.JSONField("получатели", default=list)
+    status = django.db.models.CharField(
+        "статус",
+        max_length=20,
+        choices=StatusChoices,
+        default=StatusChoices.Pending,
+    )
+    attempts = django.db.models.PositiveIntegerField("попыток отправки", default=0)
+    error = django.db.models.TextField("ошибка", blank=True)
+    created_at = django.db.models.DateTimeField(auto_now_add=True)
+    next_attempt_at = django.db.models.DateTimeField(
+        "следующая попытка",
+        default=django.utils.timezone.now,
+    )
+    claimed_at = django.db.models.DateTimeField(null=True, blank=True)
+    sent_at = django.db.models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "исходящее письмо"
+        verbose_name_plural = "исходящие письма"
+        indexes = [
+            django.db.models.Index(
+                fields=["next_attempt_at"],
+                condition=django.db.models.Q(status="Pending"),
+                name="outgoingmail_pending_idx",
+            ),
+        ]
@@ -0,0 +1,105 @@
+__all__ = ("iter_records",)
+
+import csv
+
+MAX_COLUMNS = 30
+
+
+def _iter_csv(file_path, delimiter):
+    with open(file_path, encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f, delimiter=delimiter)
+
+
+def _iter_xlsx(file_path):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_xls(file_path):
+    import xlrd
+
+    workbook = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        for index in range(sheet.nrows):
+            yield sheet.row_values(index)
+    finally:
+        workbook.release_resources()
+
+
+def _iter_ods(file_path):
+    import pandas
+
+    frame = pandas.read_excel(file_path, engine="odf", header=None, dtype=str)
+    yield from frame.fillna("").itertuples(index=False, name=None)
+
+
+def iter_rows(file_path, delimiter=","):
+    if file_path.endswith(".xlsx"):
+        rows = _iter_xlsx(file_path)
+    elif file_path.endswith(".xls"):
+        rows = _iter_xls(file_path)
+    elif file_path.endswith(".ods"):
+        rows = _iter_ods(file_path)
+    elif file_path.endswith(".csv"):
+        rows = _iter_csv(file_path, delimiter)
+    else:
+        raise ValueError("Unsupported file format")
+
+    for row in rows:
+        cells = ["" if cell is None else str(cell).strip() for cell in row]
+        if any(cells):
+            yield cells
+
+
+def _find_column(header, name):
+    for index, column in enumerate(header):
+        if name in column.lower():
+            return index
+
+    return None
+
+
+def get_record_parser(header):
+    if len(header) >= MAX_COLUMNS:
+        raise ValueError("Привышен лимит учеников")
+
+    fio_col = _find_column(header, "фио")
+    if fio_col is not None:
+
+        def parse(row):
+            fio = row[fio_col].split() if fio_col < len(row) else []
+            if len(fio) not in [2, 3]:
+                raise ValueError("Не все ФИО соответствуют стандарту")
+
+            return (fio[0], fio[1], fio[2] if len(fio) == 3 else "-")
+
+        return parse
+
+    columns = [_find_column(header, name) for name in ("фамилия", "имя", "отчество")]
+    if None in columns:
+        raise ValueError("Не найдены столбцы с ФИО")
+
+    def parse(row):
+        return tuple(row[col] if col < len(row) else "" for col in columns)
+
+    return parse
+
+
+def iter_records(file_path, delimiter=",", limit=None):
+    rows = iter_rows(file_path, delimiter=delimiter)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    parse = get_record_parser(header)
+    for index, row in enumerate(rows, 1):
+        if limit is not None and index > limit:
+            raise ValueError("Привышен лимит учеников")
+
+        yield parse(row)
@@ -1,11 +1,38 @@
 __all__ = []
 
+import datetime
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+import django.conf
+import django.contrib.auth
 import django.contrib.auth.models as auth_models
+import django.core.cache
+import django.core.mail
+import django.core.management
+import django.db
 import django.shortcuts
 import django.test
+import django.test.utils
+import django.utils.timezone
+import openpyxl
+import PIL.Image
+import PIL.ImageDraw
 
+import passes.models
+import users.backends
+import users.codes
 import users.forms
+import users.hashers
+import users.mail
 import users.models
+import users.readers
+import users.throttling
+import users.utils
 
 
 class SignUpViewTests(django.test.TestCase):
@@ -88,6 +115,12 @@ class UploadAvatarPageViewTests(django.test.TestCase):
         response = self.client.get(django.shortcuts.reverse("users:profile"))
         self.assertEqual(response.status_code, 404)
 
+    def test_session_user_is_loaded_with_profile(self):
+        backend = users.backends.EmailOrUsernameModelBackend()
+        with self.assertNumQueries(1):
+            user = backend.get_user(self.student_user.id)
+            self.assertEqual(user.profile.role, "ученик")
+
 
 class UploadStudentsViewTests(django.test.TestCase):
     def setUp(self):
@@ -151,3 +184,439 @@ class ResetStudentsViewTests(django.test.TestCase):
             auth_models.User.objects.filter(username="0001-a0b1c2").count(),
             0,
         )
+
+
+class CodesSheetTests(django.test.TestCase):
+    def setUp(self):
+        private_root = tempfile.TemporaryDirectory()
+        self.addCleanup(private_root.cleanup)
+        settings = self.settings(
+            STORAGES={
+                **django.conf.settings.STORAGES,
+                "codes": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": private_root.name},
+                },
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.curator_user = auth_models.User.objects.create_user(
+            username="curator",
+            password="testpass123",
+        )
+        users.models.Profile.objects.create(
+            user=self.curator_user,
+            role="куратор",
+            middle_name="",
+        )
+        self.group = auth_models.Group.objects.create(name="Test Group")
+        users.models.GroupLeader.objects.create(
+            group=self.group,
+            curator=self.curator_user,
+        )
+        self.tokens = users.utils.create_students(
+            [("Петров", "Пётр", "Петрович"), ("Иванов", "Иван")],
+            self.group.id,
+        )
+        self.client.login(username="curator", password="testpass123")
+
+    def download(self, file_format):
+        response = self.client.get(
+            django.shortcuts.reverse(
+                "users:upload-result-codes",
+                args=[self.group.name, file_format],
+            ),
+        )
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_result_page_does_not_render_codes(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                django.shortcuts.reverse("users:upload-result", args=["Test Group"]),
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, self.tokens[0])
+
+    def test_long_name_stays_inside_its_column(self):
+        draw = PIL.ImageDraw.Draw(PIL.Image.new("L", (1, 1)))
+        width = dict(users.codes.COLUMNS)["ФИО"]
+        for name in (
+            "Муравьёва-Апостол Елизавета Константиновна",
+            "Муравьёва-Апостол-Преображенская Елизавета-Анастасия Константиновна",
+            "Ы" * 200,
+        ):
+            with self.subTest(name=name):
+                text, font = users.codes._fit_cell(draw, name, width)
+                left, top, right, bottom = draw.multiline_textbbox(
+                    (0, 0),
+                    text,
+                    font,
+                )
+                self.assertLessEqual(
+                    right - left,
+                    width - 2 * users.codes.CELL_PADDING,
+                )
+                self.assertLessEqual(bottom - top, users.codes.ROW_HEIGHT)
+
+    def test_sheets_are_rendered_once(self):
+        render_pdf = mock.Mock(wraps=users.codes.render_pdf)
+        with mock.patch.dict(users.codes.RENDERERS, {"pdf": render_pdf}):
+            self.assertTrue(self.download("pdf").startswith(b"%PDF"))
+            self.download("pdf")
+
+        render_pdf.assert_called_once()
+        rows = self.download("csv").decode("utf-8-sig").splitlines()
+        self.assertEqual(len(rows), 3)
+        self.assertIn("Петров,Пётр,Петрович", rows[2])
+        self.assertIn(self.tokens[0], rows[2])
+
+    def test_unknown_format_returns_404(self):
+        response = self.client.get(
+            django.shortcuts.reverse(
+                "users:upload-result-codes",
+                args=[self.group.name, "xlsx"],
+            ),
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_reset_invalidates_sheet(self):
+        self.download("csv")
+        self.client.post(
+            django.shortcuts.reverse("users:reset"),
+            {"token": self.tokens[0]},
+        )
+
+        csv_content = self.download("csv").decode("utf-8-sig")
+        self.assertNotIn(self.tokens[0], csv_content)
+        self.assertIn(
+            auth_models.User.objects.get(last_name="Петров").username,
+            csv_content,
+        )
+
+
+class StudentCodeLoginTests(django.test.TestCase):
+    def setUp(self):
+        self.group = auth_models.Group.objects.create(name="Test Group")
+        self.code = users.utils.create_student(
+            "Петров",
+            "Пётр",
+            "Петрович",
+            group_id=self.group.id,
+        )
+
+    def test_login_uses_code_digest_without_password_hasher(self):
+        with mock.patch.object(
+            users.hashers.StudentCodeHasher,
+            "verify",
+        ) as verify:
+            response = self.client.post(
+                django.shortcuts.reverse("users:login-student"),
+                {"code": self.code},
+            )
+
+        self.assertEqual(response.status_code, 302)
+        verify.assert_not_called()
+        self.assertEqual(
+            int(self.client.session[django.contrib.auth.SESSION_KEY]),
+            auth_models.User.objects.get(username=self.code).id,
+        )
+
+    def test_unknown_code_is_rejected(self):
+        self.assertIsNone(django.contrib.auth.authenticate(code="0001-0abcdef"))
+        self.assertIsNone(
+            django.contrib.auth.authenticate(
+                username="0001-0abcdef",
+                password="0001-0abcdef",
+            ),
+        )
+
+    def test_student_without_digest_is_migrated_on_login(self):
+        profile = users.models.Profile.objects.get(user__username=self.code)
+        profile.code_digest = None
+        profile.save()
+
+        user = django.contrib.auth.authenticate(code=self.code)
+
+        self.assertEqual(user.username, self.code)
+        profile.refresh_from_db()
+        self.assertEqual(profile.code_digest, users.hashers.code_digest(self.code))
+
+
+class LoginThrottleTests(django.test.TestCase):
+    def setUp(self):
+        django.core.cache.cache.clear()
+        self.addCleanup(django.core.cache.cache.clear)
+        self.curator_user = auth_models.User.objects.create_user(
+            username="curator",
+            email="curator@example.com",
+            password="testpass123",
+        )
+        users.models.Profile.objects.create(user=self.curator_user, role="куратор")
+
+    def test_failed_logins_write_only_on_lockout(self):
+        limit = django.conf.settings.MAX_AUTH_ATTEMPTS
+        with django.test.utils.CaptureQueriesContext(
+            django.db.connection,
+        ) as queries:
+            for _ in range(limit - 1):
+                django.contrib.auth.authenticate(username="curator", password="x")
+
+        self.assertTrue(
+            all(query["sql"].startswith("SELECT") for query in queries),
+        )
+        self.curator_user.refresh_from_db()
+        self.assertTrue(self.curator_user.is_active)
+
+        django.contrib.auth.authenticate(username="curator", password="x")
+
+        self.curator_user.refresh_from_db()
+        self.assertFalse(self.curator_user.is_active)
+        self.assertIsNotNone(self.curator_user.profile.attempts_time)
+
+    def test_successful_login_resets_account_counter(self):
+        limit = django.conf.settings.MAX_AUTH_ATTEMPTS
+        for _ in range(limit - 1):
+            django.contrib.auth.authenticate(username="curator", password="x")
+
+        django.contrib.auth.authenticate(username="curator", password="testpass123")
+        django.contrib.auth.authenticate(username="curator", password="x")
+
+        self.curator_user.refresh_from_db()
+        self.assertTrue(self.curator_user.is_active)
+
+    def test_ip_is_throttled_across_accounts(self):
+        group = auth_models.Group.objects.create(name="Test Group")
+        code = users.utils.create_student("Петров", "Пётр", group_id=group.id)
+        login_url = django.shortcuts.reverse("users:login-student")
+        with self.settings(MAX_AUTH_ATTEMPTS_PER_IP=3):
+            for index in range(3):
+                self.client.post(login_url, {"code": f"0001-0abcde{index}"})
+
+            response = self.client.post(login_url, {"code": code})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(django.contrib.auth.SESSION_KEY, self.client.session)
+
+    def test_password_login_is_refused_from_throttled_ip(self):
+        login_url = django.shortcuts.reverse("users:login-curator")
+        limit = django.conf.settings.MAX_AUTH_ATTEMPTS
+        with self.settings(MAX_AUTH_ATTEMPTS_PER_IP=3):
+            for _ in range(3 * limit):
+                self.client.post(
+                    login_url,
+                    {"username": "curator", "password": "wrong"},
+                )
+
+            response = self.client.post(
+                login_url,
+                {"username": "curator", "password": "testpass123"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(django.contrib.auth.SESSION_KEY, self.client.session)
+        self.curator_user.refresh_from_db()
+        self.assertTrue(self.curator_user.is_active)
+
+    def test_ip_header_is_configurable(self):
+        request = django.test.RequestFactory().post(
+            "/",
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="203.0.113.7, 198.51.100.2",
+        )
+        self.assertEqual(users.throttling.client_ip(request), "10.0.0.1")
+        with self.settings(LOGIN_THROTTLE_IP_HEADER="HTTP_X_FORWARDED_FOR"):
+            self.assertEqual(users.throttling.client_ip(request), "198.51.100.2")
+
+    def test_attempts_slide_out_of_the_window(self):
+        window = django.conf.settings.LOGIN_ATTEMPTS_WINDOW
+        users.throttling.register_failure("account", 1, now=window)
+        users.throttling.register_failure("account", 1, now=window)
+
+        self.assertEqual(users.throttling.attempts("account", 1, now=window), 2)
+        self.assertEqual(
+            users.throttling.attempts("account", 1, now=window * 2.5),
+            1,
+        )
+        self.assertEqual(users.throttling.attempts("account", 1, now=window * 3), 0)
+
+
+class OutgoingMailTests(django.test.TestCase):
+    def test_signup_only_enqueues_mail(self):
+        with self.settings(DEFAULT_USER_IS_ACTIVE=False):
+            self.client.post(
+                django.shortcuts.reverse("users:signup"),
+                {
+                    "username": "testuser",
+                    "email": "test@example.com",
+                    "password1": "testpass123",
+                    "password2": "testpass123",
+                },
+            )
+
+        self.assertEqual(len(django.core.mail.outbox), 0)
+        outgoing = users.models.OutgoingMail.objects.get()
+        self.assertEqual(outgoing.recipients, ["test@example.com"])
+
+        django.core.management.call_command(
+            "send_queued_mail",
+            "--once",
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(len(django.core.mail.outbox), 1)
+        self.assertEqual(django.core.mail.outbox[0].to, ["test@example.com"])
+        outgoing.refresh_from_db()
+        self.assertEqual(outgoing.status, users.models.OutgoingMail.StatusChoices.Sent)
+
+    def test_batch_reuses_connection_and_retries_failures(self):
+        for index in range(3):
+            users.mail.enqueue_mail("subject", "body", [f"user{index}@example.com"])
+
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send_messages.side_effect = [1, OSError("smtp down"), 1]
+        with mock.patch.object(
+            django.core.mail,
+            "get_connection",
+            return_value=connection,
+        ) as get_connection:
+            sent = users.mail.send_mail_batch(users.mail.claim_mail_batch())
+
+        self.assertEqual(sent, 2)
+        get_connection.assert_called_once()
+        failed = users.models.OutgoingMail.objects.get(
+            recipients=["user1@example.com"],
+        )
+        self.assertEqual(failed.status, users.models.OutgoingMail.StatusChoices.Pending)
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.next_attempt_at, django.utils.timezone.now())
+        self.assertEqual(users.mail.claim_mail_batch(), [])
+
+    def test_mail_of_crashed_sender_is_claimed_again(self):
+        mail = users.mail.enqueue_mail("subject", "body", ["user@example.com"])
+        self.assertEqual(users.mail.claim_mail_batch(), [mail])
+        self.assertEqual(users.mail.claim_mail_batch(), [])
+
+        users.models.OutgoingMail.objects.filter(pk=mail.pk).update(
+            claimed_at=django.utils.timezone.now()
+            - datetime.timedelta(seconds=django.conf.settings.MAIL_QUEUE_LEASE + 1),
+        )
+
+        self.assertEqual(users.mail.claim_mail_batch(), [mail])
+        self.assertEqual(users.mail.send_mail_batch([mail]), 1)
+        self.assertEqual(len(django.core.mail.outbox), 1)
+
+
+class StudentImportTests(django.test.TestCase):
+    def setUp(self):
+        self.group = auth_models.Group.objects.create(name="Test Group")
+
+    def write_csv(self, rows):
+        temp_file = tempfile.NamedTemporaryFile(
+            "w",
+            suffix=".csv",
+            delete=False,
+            encoding="utf-8",
+        )
+        self.addCleanup(os.unlink, temp_file.name)
+        with temp_file:
+            temp_file.write("ФИО\n")
+            temp_file.writelines(f"{row}\n" for row in rows)
+
+        return temp_file.name
+
+    def test_import_uses_constant_number_of_queries(self):
+        file_path = self.write_csv(
+            [f"Иванов Иван{index} Иванович" for index in range(20)],
+        )
+        with django.test.utils.CaptureQueriesContext(
+            django.db.connection,
+        ) as queries:
+            users.utils.get_file(file_path, group_name="Test Group")
+
+        self.assertLess(len(queries), 12)
+        self.assertEqual(self.group.user_set.count(), 20)
+        self.assertEqual(
+            users.models.Profile.objects.filter(middle_name="Иванович").count(),
+            20,
+        )
+        self.assertEqual(
+            passes.models.Pass.objects.filter(user__groups=self.group).count(),
+            20,
+        )
+
+    def test_xlsx_with_separate_columns(self):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["Фамилия", "Имя", "Отчество"])
+        workbook.active.append(["Иванов", "Иван", "Иванович"])
+        workbook.active.append([None, None, None])
+        workbook.active.append(["Петров", "Петр", None])
+        temp_file = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+        self.addCleanup(os.unlink, temp_file.name)
+        with temp_file:
+            workbook.save(temp_file)
+
+        self.assertEqual(
+            list(users.readers.iter_records(temp_file.name)),
+            [("Иванов", "Иван", "Иванович"), ("Петров", "Петр", "")],
+        )
+
+    def test_csv_over_limit_is_rejected(self):
+        file_path = self.write_csv([f"Иванов Иван{index}" for index in range(4)])
+        with self.settings(STUDENTS_UPLOAD_LIMIT=3):
+            with self.assertRaises(ValueError):
+                users.utils.get_file(file_path, group_name="Test Group")
+
+        self.assertEqual(self.group.user_set.count(), 0)
+
+    def test_only_colliding_tokens_are_regenerated(self):
+        auth_models.User.objects.create_user(username="0001-8aaaaaa")
+        with mock.patch(
+            "secrets.token_hex",
+            side_effect=["aaaaaa", "bbbbbb", "cccccc"],
+        ) as token_hex:
+            tokens = users.utils.generate_tokens(
+                [("Иванов", "Иван"), ("Петров", "Петр")],
+                1,
+            )
+
+        self.assertEqual(tokens, ["0001-8cccccc", "0001-15bbbbbb"])
+        self.assertEqual(token_hex.call_count, 3)
+
+    def test_student_codes_use_dedicated_hasher(self):
+        with self.settings(STUDENT_CODE_HASH_ITERATIONS=1000):
+            token = users.utils.create_student(
+                "Иванов",
+                "Иван",
+                group_id=self.group.id,
+            )
+            student = auth_models.User.objects.get(username=token)
+
+            self.assertTrue(student.password.startswith("pbkdf2_sha256_code$1000$"))
+            self.assertEqual(
+                django.contrib.auth.authenticate(username=token, password=token),
+                student,
+            )
+
+
+class StartupImportTests(django.test.SimpleTestCase):
+    def test_wsgi_does_not_import_spreadsheet_backends(self):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, autopass.wsgi, django.urls; "
+                "django.urls.get_resolver().url_patterns; "
+                "print(*sorted(name for name in ('pandas', 'openpyxl', 'odf', 'xlrd')"
+                " if name in sys.modules))",
+            ],
+            cwd=django.conf.settings.BASE_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        self.assertEqual(output.strip(), "")
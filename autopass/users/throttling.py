@@ -0,0 +1,82 @@
+__all__ = ("attempts", "register_failure", "reset")
+
+import hashlib
+import time
+
+import django.conf
+import django.core.cache
+
+
+def _window():
+    return django.conf.settings.LOGIN_ATTEMPTS_WINDOW
+
+
+def _key(scope, identifier, bucket):
+    digest = hashlib.sha256(str(identifier).encode()).hexdigest()
+    return f"users:login:{scope}:{digest}:{bucket}"
+
+
+def _buckets(scope, identifier, now):
+    bucket, offset = divmod(now, _window())
+    return (
+        _key(scope, identifier, int(bucket)),
+        _key(scope, identifier, int(bucket) - 1),
+        offset / _window(),
+    )
+
+
+def attempts(scope, identifier, now=None):
+    current, previous, elapsed = _buckets(
+        scope,
+        identifier,
+        time.time() if now is None else now,
+    )
+    counts = django.core.cache.cache.get_many([current, previous])
+    return counts.get(current, 0) + counts.get(previous, 0) * (1 - elapsed)
+
+
+def register_failure(scope, identifier, now=None):
+    now = time.time() if now is None else now
+    current, _, _ = _buckets(scope, identifier, now)
+    cache = django.core.cache.cache
+    cache.add(current, 0, timeout=_window() * 2)
+    try:
+        cache.incr(current)
+    except ValueError:
+        cache.set(current, 1, timeout=_window() * 2)
+
+    return attempts(scope, identifier, now)
+
+
+def reset(scope, identifier, now=None):
+    current, previous, _ = _buckets(
+        scope,
+        identifier,
+        time.time() if now is None else now,
+    )
+    django.core.cache.cache.delete_many([current, previous])
+
+
+def client_ip(request):
+    if request is None:
+        return None
+
+    value = request.META.get(
+        django.conf.settings.LOGIN_THROTTLE_IP_HEADER,
+    ) or request.META.get("REMOTE_ADDR")
+    if not value:
+        return None
+
+    return value.split(",")[-1].strip() or None
+
+
+def is_ip_limited(request):
+    limit = django.conf.settings.MAX_AUTH_ATTEMPTS_PER_IP
+    ip = client_ip(request)
+    return bool(limit) and ip is not None and attempts("ip", ip) >= limit
+
+
+def register_ip_failure(request):
+    ip = client_ip(request)
+    if django.conf.settings.MAX_AUTH_ATTEMPTS_PER_IP and ip is not None:
+        register_failure("ip", ip)
@@ -51,5 +51,10 @@ urlpatterns = [
         users.views.UploadResultView.as_view(),
         name="upload-result",
     ),
+    path(
+        "upload/result/<str:group_name>/codes.<str:file_format>",
+        users.views.CodesSheetDownloadView.as_view(),
+        name="upload-result-codes",
+    ),
     path("reset/", users.views.ResetStudentsView.as_view(), name="reset"),
 ]
@@ -1,128 +1,168 @@
-__all__ = ("create_pdf", "get_file")
+__all__ = ("get_file", "save_avatar")
+import concurrent.futures
+import functools
+import io
 import secrets
 
+import django.conf
+import django.contrib.auth.hashers
 import django.contrib.auth.models
+import django.core.files.base
 import django.db
-import django.template.loader
-import pandas
+import PIL.Image
 
+import card_maker.card_maker
 import passes.models
+import passes.utils
+import users.hashers
 import users.models
+import users.readers
 
+AVATAR_THUMBNAIL_SIZE = (200, 200)
 
-def create_student(*args, group_id=0):
-    while True:
-        try:
-            token = (
-                f"{group_id:04d}-{ord(args[0][0].lower()) - ord('а')}"
-                f"{secrets.token_hex(3)}"
-            )
-            user = django.contrib.auth.models.User.objects.create_user(
-                username=token,
-                password=token,
-                is_active=True,
-                first_name=args[1],
-                last_name=args[0],
-            )
-            middle_name = "-"
-            if len(args) == 3:
-                middle_name = args[2]
-
-            users.models.Profile.objects.create(
-                user=user,
-                middle_name=middle_name,
-                role="ученик",
-            )
-            group = django.contrib.auth.models.Group.objects.get(
-                id=group_id,
-            )
-            user.groups.add(group)
-            passes.models.Pass.objects.create(
-                user=user,
-            )
-            return token
-        except django.db.IntegrityError:
-            pass
+CREATE_ATTEMPTS = 3
 
 
-def read_file(file_path, delimiter=","):
-    if file_path.endswith((".xls", ".xlsx")):
-        return pandas.read_excel(file_path)
+def _jpeg(image):
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90, optimize=True)
+    return django.core.files.base.ContentFile(buffer.getvalue())
 
-    if file_path.endswith(".ods"):
-        return pandas.read_excel(file_path, engine="odf")
 
-    if file_path.endswith(".csv"):
-        return pandas.read_csv(file_path, delimiter=delimiter)
+def save_avatar(profile, avatar_file):
+    card = card_maker.card_maker.prepare_avatar(
+        avatar_file,
+        passes.utils.CARD_CIRCLE_SIZE,
+    )
+    thumbnail = card.resize(AVATAR_THUMBNAIL_SIZE, PIL.Image.LANCZOS)
+
+    for field in (profile.avatar, profile.avatar_card, profile.avatar_thumbnail):
+        if field:
+            field.delete(save=False)
+
+    avatar_file.seek(0)
+    name = f"avatar_{profile.user_id}.jpg"
+    profile.avatar.save(
+        name,
+        django.core.files.base.ContentFile(avatar_file.read()),
+        save=False,
+    )
+    profile.avatar_card.save(name, _jpeg(card), save=False)
+    profile.avatar_thumbnail.save(name, _jpeg(thumbnail), save=False)
+    profile.save()
 
-    raise ValueError("Unsupported file format")
 
+def generate_token(last_name, group_id):
+    return (
+        f"{group_id:04d}-{ord(last_name[0].lower()) - ord('а')}"
+        f"{secrets.token_hex(3)}"
+    )
 
-def get_file(file_path, group_name=None, delimiter=","):
-    file = read_file(file_path, delimiter=delimiter)
-    rows, cols = file.shape
-    if rows >= 200 or cols >= 30:
-        raise ValueError("Привышен лимит учеников")
 
-    fio_columns = [col for col in file.columns if "фио" in col.lower()]
-    if fio_columns:
-        for fio in file[fio_columns[0]].tolist():
-            if len(fio.split()) not in [2, 3]:
-                raise ValueError("Не все ФИО соответствуют стандарту")
+def generate_tokens(records, group_id):
+    tokens = [None] * len(records)
+    colliding = list(range(len(records)))
+    while colliding:
+        for index in colliding:
+            tokens[index] = generate_token(records[index][0], group_id)
 
-        group_obj = django.contrib.auth.models.Group.objects.get(
-            name=group_name,
+        taken = set(
+            django.contrib.auth.models.User.objects.filter(
+                username__in=[tokens[index] for index in colliding],
+            ).values_list("username", flat=True),
         )
-        group_id = group_obj.id
-        for fio in file[fio_columns[0]].tolist():
-            if len(fio_list := fio.split()) not in [2, 3]:
-                raise ValueError("Не все ФИО соответствуют стандарту")
-
-            create_student(*fio_list, group_id=group_id)
-    else:
-        surname_col = None
-        name_col = None
-        middle_col = None
-
-        for col in file.columns:
-            if "фамилия" in col.lower():
-                surname_col = col
-                break
-
-        for col in file.columns:
-            if "имя" in col.lower():
-                name_col = col
-                break
-
-        for col in file.columns:
-            if "отчество" in col.lower():
-                middle_col = col
-                break
-
-        if surname_col and name_col and middle_col:
-            group_obj = django.contrib.auth.models.Group.objects.get(
-                name=group_name,
-            )
-            group_id = group_obj.id
-            for _, row in file.iterrows():
-                last_name = str(row[surname_col]).strip()
-                first_name = str(row[name_col]).strip()
-                middle_name = str(row[middle_col]).strip()
-                create_student(
-                    last_name,
-                    first_name,
-                    middle_name,
-                    group_id=group_id,
+        seen = set()
+        colliding = []
+        for index, token in enumerate(tokens):
+            if token in taken or token in seen:
+                colliding.append(index)
+
+            seen.add(token)
+
+    return tokens
+
+
+def hash_codes(codes):
+    make_password = functools.partial(
+        django.contrib.auth.hashers.make_password,
+        hasher=django.conf.settings.STUDENT_CODE_HASHER,
+    )
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=django.conf.settings.STUDENT_CODE_HASH_WORKERS,
+    ) as pool:
+        return list(pool.map(make_password, codes))
+
+
+def create_students(records, group_id):
+    records = [
+        (record[0], record[1], record[2] if len(record) == 3 else "-")
+        for record in records
+    ]
+    for attempt in range(CREATE_ATTEMPTS):
+        tokens = generate_tokens(records, group_id)
+        passwords = hash_codes(tokens)
+        try:
+            with django.db.transaction.atomic():
+                students = django.contrib.auth.models.User.objects.bulk_create(
+                    [
+                        django.contrib.auth.models.User(
+                            username=token,
+                            password=password,
+                            is_active=True,
+                            first_name=first_name,
+                            last_name=last_name,
+                        )
+                        for token, password, (last_name, first_name, _) in zip(
+                            tokens,
+                            passwords,
+                            records,
+                        )
+                    ],
+                )
+                users.models.Profile.objects.bulk_create(
+                    [
+                        users.models.Profile(
+                            user=student,
+                            middle_name=middle_name,
+                            role="ученик",
+                            code_digest=users.hashers.code_digest(student.username),
+                        )
+                        for student, (_, _, middle_name) in zip(students, records)
+                    ],
+                )
+                membership = django.contrib.auth.models.User.groups.through
+                membership.objects.bulk_create(
+                    [
+                        membership(user_id=student.id, group_id=group_id)
+                        for student in students
+                    ],
+                )
+                passes.models.Pass.objects.bulk_create(
+                    [passes.models.Pass(user=student) for student in students],
                 )
+        except django.db.IntegrityError:
+            if attempt == CREATE_ATTEMPTS - 1:
+                raise
+
+            continue
+
+        return tokens
 
 
-def create_pdf(group_name):
-    group = django.contrib.auth.models.Group.objects.get(name=group_name)
-    users = group.user_set.all()
-    return django.template.loader.render_to_string(
-        "pdf/group_codes.html",
-        {
-            "group": group,
-            "users": users,
-        },
+def create_student(*args, group_id=0):
+    return create_students([args], group_id)[0]
+
+
+def get_file(file_path, group_name=None, delimiter=","):
+    records = list(
+        users.readers.iter_records(
+            file_path,
+            delimiter=delimiter,
+            limit=django.conf.settings.STUDENTS_UPLOAD_LIMIT,
+        ),
     )
+    if records:
+        group_obj = django.contrib.auth.models.Group.objects.get(
+            name=group_name,
+        )
+        create_students(records, group_obj.id)
@@ -12,8 +12,6 @@ import django.conf
 import django.contrib.auth.decorators
 import django.contrib.auth.models
 import django.contrib.messages
-import django.core.files.base
-import django.core.mail
 import django.http
 import django.shortcuts
 import django.urls
@@ -23,8 +21,12 @@ import django.views.generic
 
 import curator.views
 import passes.models
+import passes.utils
+import users.codes
 import users.forms
+import users.mail
 import users.models
+import users.throttling
 import users.utils
 
 
@@ -51,15 +53,13 @@ class SignUpView(django.views.generic.View):
             )
 
             if not user.is_active:
-                django.core.mail.send_mail(
+                users.mail.enqueue_mail(
                     subject="Подтвердите вашу почту",
                     message="Для подтверждения почты перейдите по ссылке"
                     f" - /activate/{user.username}",
-                    from_email=django.conf.settings.DEFAULT_FROM_EMAIL,
                     recipient_list=[
                         users.models.User.objects.normalize_email(user.email),
                     ],
-                    fail_silently=False,
                 )
 
             return django.shortcuts.redirect("users:login-curator")
@@ -93,6 +93,7 @@ class ActivateUserView(django.views.generic.View):
                         user_profile.attempts_time = None
                         user_profile.attempts_count = 0
                         user_profile.save()
+                        users.throttling.reset("account", user.pk)
                         return django.shortcuts.render(
                             request,
                             "users/activate_done.html",
@@ -158,15 +159,8 @@ class UploadAvatarApiView(django.views.generic.View):
                 )
 
             profile = request.user.profile
-
-            if profile.avatar:
-                profile.avatar.delete(save=False)
-
-            profile.avatar.save(
-                f"avatar_{request.user.id}.jpg",
-                django.core.files.base.ContentFile(avatar_file.read()),
-            )
-            profile.save()
+            users.utils.save_avatar(profile, avatar_file)
+            passes.utils.get_card_cache().invalidate(request.user.id)
 
             passes.models.Pass.objects.filter(user=request.user).update(
                 status="NotVerify",
@@ -175,7 +169,7 @@ class UploadAvatarApiView(django.views.generic.View):
                 {
                     "status": "success",
                     "message": "Фото успешно загружено",
-                    "avatar_url": profile.avatar.url,
+                    "avatar_url": profile.avatar_thumbnail.url,
                 },
             )
 
@@ -193,6 +187,11 @@ class UploadStudentsView(
     template_name = "pdf/upload_students.html"
     form_class = users.forms.UploadFileForm
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["students_limit"] = django.conf.settings.STUDENTS_UPLOAD_LIMIT
+        return context
+
     def form_valid(self, form):
         group_name = form.cleaned_data["group_name"]
         uploaded_file = form.cleaned_data["file"]
@@ -229,15 +228,14 @@ class UploadStudentsView(
                 group=group,
                 curator=self.request.user,
             )
-            django.core.mail.send_mail(
+            users.codes.build(group)
+            users.mail.enqueue_mail(
                 subject=f"Создана группа {group_name}",
                 message="Для получения логинов перейдите по ссылке"
                 f" - /users/upload/result/{group_name}",
-                from_email=django.conf.settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[
                     self.request.user.email,
                 ],
-                fail_silently=False,
             )
 
             return django.shortcuts.redirect(
@@ -261,9 +259,7 @@ class UploadStudentsView(
     django.contrib.auth.decorators.login_required,
     name="dispatch",
 )
-class UploadResultView(django.views.generic.TemplateView):
-    template_name = "pdf/upload_result.html"
-
+class GroupLeaderRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
         if request.user.profile.role != "куратор":
             return django.http.HttpResponseNotFound()
@@ -271,26 +267,40 @@ class UploadResultView(django.views.generic.TemplateView):
         group_name = self.kwargs.get("group_name")
 
         try:
-            group = django.contrib.auth.models.Group.objects.get(name=group_name)
+            self.group = django.contrib.auth.models.Group.objects.get(name=group_name)
         except django.contrib.auth.models.Group.DoesNotExist:
             return django.http.HttpResponseNotFound()
 
         try:
-            users.models.GroupLeader.objects.get(group=group, curator=request.user)
+            users.models.GroupLeader.objects.get(
+                group=self.group,
+                curator=request.user,
+            )
         except users.models.GroupLeader.DoesNotExist:
             return django.http.HttpResponseNotFound()
 
         return super().dispatch(request, *args, **kwargs)
 
+
+class UploadResultView(GroupLeaderRequiredMixin, django.views.generic.TemplateView):
+    template_name = "pdf/upload_result.html"
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        group_name = self.kwargs.get("group_name")
+        context["group_name"] = self.group.name
+        return context
 
-        html_content = users.utils.create_pdf(group_name)
-        context["generated_html"] = html_content
-        context["group_name"] = group_name
 
-        return context
+class CodesSheetDownloadView(GroupLeaderRequiredMixin, django.views.generic.View):
+    def get(self, request, group_name, file_format):
+        if file_format not in users.codes.RENDERERS:
+            return django.http.HttpResponseNotFound()
+
+        return django.http.FileResponse(
+            users.codes.open_sheet(self.group, file_format),
+            as_attachment=True,
+            filename=f"{self.group.name}-codes.{file_format}",
+        )
 
 
 class ResetStudentsView(
@@ -318,6 +328,7 @@ class ResetStudentsView(
                 *[user.last_name, user.first_name, user.profile.middle_name],
                 group_id=group.id,
             )
+            users.codes.invalidate(group)
             django.contrib.messages.success(
                 self.request,
                 f"Логин был сброшен. \nДанные обновлены в общей таблице "
@@ -0,0 +1,142 @@
+__all__ = ()
+
+import argparse
+import json
+import pathlib
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent / "autopass"
+
+COMPOSITORS = ("pil", "numpy")
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(function, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings)
+
+
+def blend(editor, context, photo):
+    import card_maker.compositing
+
+    if editor.compositor == "numpy":
+        return card_maker.compositing.blend_photo(
+            context,
+            photo,
+            editor.photo_position,
+        )
+
+    rounded = photo.copy()
+    rounded.putalpha(context.mask)
+    return editor.put_photo_in_template(rounded)
+
+
+def probe(compositor, runs, photo_size):
+    sys.path.insert(0, str(PROJECT_DIR))
+    import PIL.Image
+
+    import card_maker.card_maker
+
+    photo = PIL.Image.radial_gradient("L").resize(photo_size).convert("RGB")
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as photo_file:
+        photo.save(photo_file, "JPEG", quality=90)
+        photo_file.flush()
+        editor = card_maker.card_maker.ImageEditor(
+            template_path=str(PROJECT_DIR / "template.png"),
+            circle_size=(760, 760),
+            photo_position=(155, 165),
+            text_position=(950, 600),
+            compositor=compositor,
+        )
+        context = editor.context
+        prepared = editor.prepare_photo(photo_file.name)
+        baseline = max_rss_mb()
+        if compositor == "numpy":
+            import numpy  # noqa: F401
+
+        imported = max_rss_mb()
+        render_ms = timed(
+            lambda: editor.render(photo_file.name, "Иван Иванов"),
+            runs,
+        )
+        composite_ms = timed(lambda: editor.composite(photo_file.name), runs)
+        blend_ms = timed(lambda: blend(editor, context, prepared), runs)
+
+    return {
+        "render_ms": render_ms,
+        "composite_ms": composite_ms,
+        "blend_ms": blend_ms,
+        "baseline_mb": baseline,
+        "import_mb": imported - baseline,
+        "peak_mb": max_rss_mb() - imported,
+    }
+
+
+def run_probe(compositor, runs, photo_size):
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--probe",
+            compositor,
+            "--runs",
+            str(runs),
+            "--photo-size",
+            *map(str, photo_size),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-card latency and peak RSS of the card compositors",
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--photo-size", type=int, nargs=2, default=(1200, 1600))
+    parser.add_argument("--probe", choices=COMPOSITORS, help=argparse.SUPPRESS)
+    parser.add_argument("compositors", nargs="*")
+    args = parser.parse_args()
+    photo_size = tuple(args.photo_size)
+
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.runs, photo_size)))
+        return 0
+
+    print(f"photo:    {photo_size[0]}x{photo_size[1]}")
+    print(f"runs:     {args.runs}")
+    print()
+    print(
+        f"{'backend':<8} {'render ms':>10} {'photo ms':>10} {'blend ms':>10}"
+        f" {'base MB':>10} {'import +MB':>11} {'peak +MB':>10}",
+    )
+    for compositor in args.compositors or COMPOSITORS:
+        result = run_probe(compositor, args.runs, photo_size)
+        print(
+            f"{compositor:<8} {result['render_ms']:>10.1f}"
+            f" {result['composite_ms']:>10.1f} {result['blend_ms']:>10.1f}"
+            f" {result['baseline_mb']:>10.1f} {result['import_mb']:>11.1f}"
+            f" {result['peak_mb']:>10.1f}",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+__all__ = ()
+
+import argparse
+import io
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent / "autopass"
+
+
+def render_card(photo_size):
+    import PIL.Image
+
+    import card_maker.card_maker
+
+    photo = PIL.Image.radial_gradient("L").resize(photo_size).convert("RGB")
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as photo_file:
+        photo.save(photo_file, "JPEG", quality=90)
+        photo_file.flush()
+        editor = card_maker.card_maker.ImageEditor(
+            template_path=str(PROJECT_DIR / "template.png"),
+            circle_size=(760, 760),
+            photo_position=(155, 165),
+            text_position=(950, 600),
+        )
+        return editor.render(photo_file.name, "Иван Иванов")
+
+
+def measure(encoding, image, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        content = encoding.encode(image)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings), len(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encode time and size of a rendered pass per encoding profile",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--photo-size", type=int, nargs=2, default=(1200, 1600))
+    parser.add_argument("profiles", nargs="*")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_DIR))
+    import card_maker.encoding
+
+    profiles = args.profiles or list(card_maker.encoding.ENCODINGS)
+    image = render_card(tuple(args.photo_size))
+    raw = io.BytesIO()
+    image.save(raw, "BMP")
+
+    print(f"card:     {image.size[0]}x{image.size[1]} {image.mode}")
+    print(f"raw:      {len(raw.getvalue()) / 1024:.0f} KB")
+    print()
+    print(f"{'profile':<10} {'encode ms':>10} {'size KB':>10}")
+    for name in profiles:
+        encoding = card_maker.encoding.get_encoding(name)
+        elapsed, size = measure(encoding, image, args.runs)
+        print(f"{name:<10} {elapsed:>10.1f} {size / 1024:>10.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
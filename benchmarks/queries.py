@@ -0,0 +1,166 @@
+__all__ = ()
+
+import argparse
+import os
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent / "autopass"
+
+
+def setup():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "autopass.settings")
+
+    import django
+
+    django.setup()
+
+
+def seed(groups_count, students_count):
+    import django.contrib.auth.models
+
+    import passes.models
+    import users.models
+
+    user_model = django.contrib.auth.models.User
+    rng = random.Random(0)
+    statuses = [choice for choice, _ in passes.models.Pass.RatingChoices.choices]
+
+    curator = user_model.objects.create_user(username="curator", password="-")
+    users.models.Profile.objects.create(user=curator, role="куратор")
+    groups = django.contrib.auth.models.Group.objects.bulk_create(
+        [
+            django.contrib.auth.models.Group(name=f"group-{number:04}")
+            for number in range(groups_count)
+        ],
+    )
+    users.models.GroupLeader.objects.bulk_create(
+        [users.models.GroupLeader(group=group, curator=curator) for group in groups],
+    )
+
+    membership = user_model.groups.through
+    for group in groups:
+        students = user_model.objects.bulk_create(
+            [
+                user_model(
+                    username=f"{group.id}-{number}",
+                    password="!",
+                    first_name="Имя",
+                    last_name="Фамилия",
+                )
+                for number in range(students_count)
+            ],
+        )
+        users.models.Profile.objects.bulk_create(
+            [
+                users.models.Profile(user=student, middle_name="-", role="ученик")
+                for student in students
+            ],
+        )
+        membership.objects.bulk_create(
+            [membership(user_id=student.id, group_id=group.id) for student in students],
+        )
+        passes.models.Pass.objects.bulk_create(
+            [
+                passes.models.Pass(user=student, status=rng.choice(statuses))
+                for student in students
+            ],
+        )
+
+    return curator, groups[len(groups) // 2]
+
+
+def drop_indexes():
+    import django.db
+
+    import passes.models
+    import users.models
+
+    with django.db.connection.schema_editor() as editor:
+        for model in (passes.models.Pass, users.models.GroupLeader):
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+
+
+def get_queries(leader, group):
+    import django.test
+
+    import curator.views
+    import passes.models
+    import passes.utils
+    import users.models
+
+    request = django.test.RequestFactory().get("/curator/requests/")
+    request.user = leader
+    view = curator.views.PassRequestsView()
+    view.setup(request)
+
+    return {
+        "curator pass requests": view.get_queryset(),
+        "group verified passes": passes.utils.get_group_passes(group),
+        "group pending passes": passes.models.Pass.objects.filter(
+            user__groups=group,
+            status__in=["NotFilledIn", "NotVerify"],
+        ),
+        "group leader lookup": users.models.GroupLeader.objects.filter(
+            group=group,
+            curator=leader,
+        ),
+    }
+
+
+def measure(queryset, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query plans and timings of the pass listing queries",
+    )
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--without-indexes", action="store_true")
+    args = parser.parse_args()
+
+    setup()
+
+    import django.db
+
+    creation = django.db.connection.creation
+    old_name = creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        started = time.perf_counter()
+        leader, group = seed(args.groups, args.students)
+        seeded = (time.perf_counter() - started) * 1000
+        if args.without_indexes:
+            drop_indexes()
+
+        with django.db.connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        print(f"database:    {django.db.connection.vendor}")
+        print(f"seeded:      {args.groups} x {args.students} in {seeded:.0f} ms")
+        print(f"indexes:     {'dropped' if args.without_indexes else 'kept'}")
+        for name, queryset in get_queries(leader, group).items():
+            print()
+            print(f"== {name}: {measure(queryset, args.runs):.2f} ms (median)")
+            print(queryset.explain())
+    finally:
+        creation.destroy_test_db(old_name, verbosity=0)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+__all__ = ()
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent / "autopass"
+
+HEAVY_MODULES = ("numpy", "odf", "openpyxl", "pandas", "xlrd")
+
+PROBE = """
+import json
+import resource
+import sys
+import time
+
+started = time.perf_counter()
+import autopass.wsgi
+import django.urls
+
+django.urls.get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+print(
+    json.dumps(
+        {
+            "import_ms": elapsed * 1000,
+            "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "heavy": sorted(
+                name for name in %r if name in sys.modules
+            ),
+        },
+    ),
+)
+""" % (
+    HEAVY_MODULES,
+)
+
+
+def probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import time and RSS of autopass.wsgi.application",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-rss-mb", type=float)
+    args = parser.parse_args()
+
+    results = [probe() for _ in range(args.runs)]
+    import_ms = statistics.median(result["import_ms"] for result in results)
+    rss_mb = statistics.median(result["rss_mb"] for result in results)
+    heavy = sorted({name for result in results for name in result["heavy"]})
+
+    print(f"runs:        {args.runs}")
+    print(f"import time: {import_ms:.1f} ms (median)")
+    print(f"max RSS:     {rss_mb:.1f} MB (median)")
+    print(f"heavy mods:  {', '.join(heavy) or '-'}")
+
+    failed = bool(heavy)
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        failed = True
+
+    if args.max_rss_mb is not None and rss_mb > args.max_rss_mb:
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())